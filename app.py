@@ -16,61 +16,256 @@ WSGI Server: Production Ready
 Domain Mapping: Compatible
 """
 
-from flask import Flask, request, jsonify, render_template_string, render_template, make_response, session, Response, redirect
+from flask import Flask, request, jsonify, render_template_string, render_template, stream_template, make_response, send_from_directory, session, Response, redirect, g
+from flask.json.provider import DefaultJSONProvider
+from markupsafe import escape
+from werkzeug.datastructures import Headers
+from jinja2 import FileSystemBytecodeCache
 import socket
 import os
 import re
 import logging
+import logging.handlers
 import platform
 import subprocess
 import sys
+import tempfile
 import webbrowser
 import threading
-import random
-from datetime import datetime, timedelta
+import queue
+from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
+from string import Template
 import json
 import hmac
 import hashlib
+import functools
+import concurrent.futures
+import importlib.util
 import time
+import atexit
 import base64
+import uuid
+import zlib
 
-# Configure logging for production cloud environments
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Optional backends - the app falls back to generated codes and session data without them
+try:
+    from scripts.database_client import DatabaseClient
+except ImportError:
+    DatabaseClient = None
+
+try:
+    from scripts.secret_manager_client import SecretManagerClient
+except ImportError:
+    SecretManagerClient = None
+
+# Optional faster JSON encoder for jsonify responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Database connection string is fixed for the life of the process
+DATABASE_CONNECTION_STRING = os.environ.get('DATABASE_CONNECTION_STRING')
+
+@functools.cache
+def get_database_client():
+    """
+    Shared DatabaseClient for this process.
+    Returns None when no database is configured or the client is not installed.
+    """
+    if not DATABASE_CONNECTION_STRING or DatabaseClient is None:
+        return None
+    return DatabaseClient(connection_string=DATABASE_CONNECTION_STRING)
+
+def _close_database_pool_before_fork():
+    """Drop pooled connections so forked workers open their own"""
+    if get_database_client.cache_info().currsize:
+        db_client = get_database_client()
+        if db_client:
+            db_client.close_pool()
+
+# Anything that opens the pool in Gunicorn's --preload master must not hand
+# its pooled sockets to every worker
+os.register_at_fork(before=_close_database_pool_before_fork)
+
+# Database writes made on behalf of a request are queued and run on a
+# background thread so the response does not wait on the inserts
+_db_write_queue = queue.Queue(maxsize=1000)
+_db_writer_pid = None
+_db_writer_lock = threading.Lock()
+
+def _db_writer_loop():
+    """Run queued DatabaseClient writes one at a time"""
+    while True:
+        method_name, kwargs = _db_write_queue.get()
+        try:
+            db_client = get_database_client()
+            if db_client:
+                getattr(db_client, method_name)(**kwargs)
+        except Exception as e:
+            logger.error("Background database write %s failed: %s", method_name, e)
+        finally:
+            _db_write_queue.task_done()
+
+def queue_db_write(method_name, **kwargs):
+    """
+    Queue a DatabaseClient write (e.g. 'log_usage') to run off the request thread.
+    The writer thread is started per process, so it also works after a pre-fork.
+    Writes are dropped with a warning if the queue is full.
+    """
+    global _db_writer_pid
+    
+    if _db_writer_pid != os.getpid():
+        with _db_writer_lock:
+            if _db_writer_pid != os.getpid():
+                threading.Thread(target=_db_writer_loop, name='db-writer', daemon=True).start()
+                _db_writer_pid = os.getpid()
+    
+    try:
+        _db_write_queue.put_nowait((method_name, kwargs))
+    except queue.Full:
+        logger.warning("Database write queue is full, dropping %s", method_name)
+
+# Database reads made on behalf of a request run on a small pool, so a stuck
+# query gives up after DATABASE_QUERY_TIMEOUT instead of pinning the request
+# thread. A read that times out keeps running (and keeps its connection), so
+# the connection pool reserves one connection per query worker on top of the
+# request threads and the writer (see database_client.default_pool_size).
+DATABASE_QUERY_TIMEOUT = float(os.environ.get('DATABASE_QUERY_TIMEOUT', '2.0'))  # seconds
+DATABASE_QUERY_WORKERS = int(os.environ.get('DATABASE_QUERY_WORKERS', '4'))
+_db_query_pool = None
+_db_query_pool_pid = None
+_db_query_pool_lock = threading.Lock()
+
+def run_db_query(query, *args, **kwargs):
+    """
+    Run a DatabaseClient read (e.g. db_client.get_visitor_recovery_summary) on the query pool.
+    Raises concurrent.futures.TimeoutError if it does not finish within DATABASE_QUERY_TIMEOUT.
+    The pool is created per process, so it also works after a pre-fork.
+    """
+    global _db_query_pool, _db_query_pool_pid
+    
+    if _db_query_pool_pid != os.getpid():
+        with _db_query_pool_lock:
+            if _db_query_pool_pid != os.getpid():
+                _db_query_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=DATABASE_QUERY_WORKERS,
+                    thread_name_prefix='db-query'
+                )
+                _db_query_pool_pid = os.getpid()
+    
+    future = _db_query_pool.submit(query, *args, **kwargs)
+    try:
+        return future.result(timeout=DATABASE_QUERY_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        # Drop it if it never got a worker; a running query finishes in the background
+        future.cancel()
+        raise
+
+@functools.cache
+def get_secret_manager_client():
+    """Shared SecretManagerClient for this process."""
+    if SecretManagerClient is None:
+        raise ImportError("scripts.secret_manager_client is not available")
+    return SecretManagerClient(os.environ.get('GOOGLE_CLOUD_PROJECT', 'yourl-cloud'))
+
+# Configure logging for production cloud environments.
+# Records go through a queue and a listener thread writes them to stderr,
+# so request threads never wait on the stream lock. Only this module's logger
+# (also Flask's app.logger) is set up; the root logger and any handlers an
+# importer (gunicorn, a test runner) installed there are left alone.
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# The queue handler only merges args into the message; the stream handler adds the prefix
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(_log_queue_handler)
+# Written once, by the listener, rather than again by whatever the root logger has
+logger.propagate = False
+_log_listener = None
+
+def _start_log_listener():
+    """Start the listener thread that drains the log queue (once per process)"""
+    global _log_listener
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+    _log_listener.start()
+
+_start_log_listener()
+# Threads do not survive a fork, so a forked worker needs its own listener
+os.register_at_fork(after_in_child=_start_log_listener)
+atexit.register(lambda: _log_listener.stop())
 
 app = Flask(__name__)
 
 # Set a secret key for Flask sessions (required for session management)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'yourl-cloud-secret-key-2024')
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson and hands the bytes straight to the response.
+    Keys stay sorted and datetimes still go through Flask's default (HTTP date) handling.
+    Calls with extra json.dumps options (indent etc.) use the stdlib encoder.
+    """
+    _OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+    
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            # Pretty-printed output is a debugging aid; leave it to the stdlib
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._OPTIONS),
+            mimetype=self.mimetype
+        )
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Let browsers cache static assets (fallback page stylesheet) for a day
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400
+
+# Templates ship with the image: skip the mtime check on every render outside
+# debug, and keep compiled bytecode on disk so workers and restarts reuse it
+app.config['TEMPLATES_AUTO_RELOAD'] = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
+_JINJA_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'yourl_jinja_cache')
+os.makedirs(_JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_JINJA_CACHE_DIR)
+
 # Configuration - Google Cloud Run compatible with domain mapping support
 HOST = '0.0.0.0'  # Listen on all interfaces (required for Cloud Run)
 
+def find_free_port():
+    """Find a free port to use for local development"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('', 0))  # Bind to any available port
+        s.listen(1)
+        port = s.getsockname()[1]
+    return port
+
 # Port configuration - Use random available port for local development, 8080 for production
 if os.environ.get('PORT'):
     # Production environment (Cloud Run) - use environment PORT
     PORT = int(os.environ.get('PORT', 8080))
 else:
-    # Local development - use random available port
-    import socket
-    def find_free_port():
-        """Find a free port to use for local development"""
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind(('', 0))  # Bind to any available port
-            s.listen(1)
-            port = s.getsockname()[1]
-        return port
-    
-    PORT = find_free_port()
+    # Local development - a free port is picked when run as a script (see __main__)
+    PORT = None
 
 DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
 # Production mode detection - All instances deploy as production instances
 PRODUCTION = True  # Always production for all deployments
 
+# Process start, for uptime monitoring (set at import so gunicorn/waitress workers have it too)
+APP_START_TIME = time.monotonic()
+
 # Cloud Run Domain Mapping Configuration
 # These settings ensure compatibility with custom domain mappings
 CLOUD_RUN_CONFIG = {
@@ -82,259 +277,278 @@ CLOUD_RUN_CONFIG = {
     "readiness_check_path": "/health"  # Readiness check endpoint
 }
 
-# Add module-level cache for generated codes
-_generated_code_cache = None
-_generated_hash_code_cache = {}
+# Fun marketing words and phrases (ASCII only) used for generated codes
+_MARKETING_WORDS = (
+    "CLOUD", "FUTURE", "INNOVATE", "DREAM", "BUILD", "CREATE", "LAUNCH", "FLY",
+    "SPARK", "SHINE", "GLOW", "RISE", "LEAP", "JUMP", "DASH", "ZOOM",
+    "POWER", "MAGIC", "WONDER", "AMAZE", "THRILL", "EXCITE", "INSPIRE", "IGNITE",
+    "ROCKET", "STAR", "MOON", "SUN", "OCEAN", "MOUNTAIN", "FOREST", "RIVER",
+    "TECH", "AI", "CODE", "DATA", "SMART", "FAST", "SECURE", "TRUST",
+    "FRIEND", "FAMILY", "TEAM", "SQUAD", "CREW", "GANG", "TRIBE", "CLAN"
+)
 
-def generate_marketing_password():
+# Fun ASCII symbols and characters
+_ASCII_SYMBOLS = ("!", "@", "#", "$", "%", "&", "*", "+", "=", "?", "~", "^")
+
+_N_WORDS = len(_MARKETING_WORDS)
+_N_SYMS = len(_ASCII_SYMBOLS)
+
+def _read_commit_hash_once():
     """
-    Generate a fun, marketing-friendly password that changes with each commit.
-    Uses git commit hash to ensure consistency within a commit but changes between commits.
-    Only uses basic ASCII characters for maximum compatibility.
+    Read the short commit hash for this build.
+    Prefers GIT_COMMIT from the build environment and falls back to a single git call.
+    Returns None when neither is available.
     """
-    global _generated_code_cache
-    
-    # Return cached code if available
-    if _generated_code_cache is not None:
-        return _generated_code_cache
+    commit_hash = os.environ.get('GIT_COMMIT')
+    if commit_hash:
+        return commit_hash[:8]
     
     try:
-        # Get the current git commit hash
-        commit_hash = subprocess.check_output(['git', 'rev-parse', 'HEAD'], 
-                                            text=True, stderr=subprocess.DEVNULL).strip()[:8]
-    except:
-        # Fallback if git is not available - use a stable identifier
-        # Use environment variable or a fixed string to ensure consistency
-        fallback_id = os.environ.get('BUILD_ID', os.environ.get('DEPLOYMENT_ID', 'stable-fallback'))
-        commit_hash = hashlib.md5(fallback_id.encode()).hexdigest()[:8]
-    
-    # Fun marketing words and phrases (ASCII only)
-    marketing_words = [
-        "CLOUD", "FUTURE", "INNOVATE", "DREAM", "BUILD", "CREATE", "LAUNCH", "FLY",
-        "SPARK", "SHINE", "GLOW", "RISE", "LEAP", "JUMP", "DASH", "ZOOM",
-        "POWER", "MAGIC", "WONDER", "AMAZE", "THRILL", "EXCITE", "INSPIRE", "IGNITE",
-        "ROCKET", "STAR", "MOON", "SUN", "OCEAN", "MOUNTAIN", "FOREST", "RIVER",
-        "TECH", "AI", "CODE", "DATA", "SMART", "FAST", "SECURE", "TRUST",
-        "FRIEND", "FAMILY", "TEAM", "SQUAD", "CREW", "GANG", "TRIBE", "CLAN"
-    ]
-    
-    # Fun ASCII symbols and characters
-    ascii_symbols = ["!", "@", "#", "$", "%", "&", "*", "+", "=", "?", "~", "^"]
-    
-    # Generate a deterministic but fun password using the commit hash
-    # Convert commit hash to a number for seeding
-    hash_num = int(commit_hash, 16)
-    random.seed(hash_num)
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()[:8] or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Commit hash is constant for the life of the process, so read it once
+_COMMIT_HASH = _read_commit_hash_once()
+
+# Build label recorded with landing-page logs; Cloud Run's revision name
+# identifies the build when the image carries no commit hash
+BUILD_VERSION = _COMMIT_HASH or os.environ.get('K_REVISION') or os.environ.get('BUILD_ID') or 'unknown'
+
+def _code_from_hash(commit_hash: str) -> str:
+    """Deterministically build a marketing password from a commit hash"""
+    # Split a digest of the hash into word, symbol and number picks
+    digest = hashlib.blake2b(commit_hash.encode(), digest_size=8).digest()
     
-    # Pick a random marketing word
-    word = random.choice(marketing_words)
+    # Pick a marketing word
+    word = _MARKETING_WORDS[digest[0] % _N_WORDS]
     
-    # Pick a random ASCII symbol
-    symbol = random.choice(ascii_symbols)
+    # Pick an ASCII symbol
+    symbol = _ASCII_SYMBOLS[digest[1] % _N_SYMS]
     
     # Generate a short number (2-3 digits)
-    number = random.randint(10, 999)
+    number = 10 + int.from_bytes(digest[2:4], 'big') % 990
     
     # Combine them in a fun way (ASCII only)
-    password = f"{word}{number}{symbol}"
-    
-    # Cache the generated code
-    _generated_code_cache = password
+    return f"{word}{number}{symbol}"
+
+@functools.cache
+def generate_marketing_password():
+    """
+    Generate a fun, marketing-friendly password that changes with each commit.
+    Uses git commit hash to ensure consistency within a commit but changes between commits.
+    Only uses basic ASCII characters for maximum compatibility.
+    """
+    commit_hash = _COMMIT_HASH
+    if not commit_hash:
+        # Fallback if git is not available - use a stable identifier
+        # Use environment variable or a fixed string to ensure consistency
+        fallback_id = os.environ.get('BUILD_ID', os.environ.get('DEPLOYMENT_ID', 'stable-fallback'))
+        commit_hash = hashlib.blake2b(fallback_id.encode(), digest_size=4).hexdigest()
     
-    return password
+    return _code_from_hash(commit_hash)
 
+@functools.lru_cache(maxsize=256)
 def generate_marketing_password_from_hash(commit_hash: str):
     """Generate marketing password from specific commit hash"""
-    global _generated_hash_code_cache
-    
-    # Return cached code if available
-    if commit_hash in _generated_hash_code_cache:
-        return _generated_hash_code_cache[commit_hash]
-    
-    # Fun marketing words and phrases (ASCII only)
-    marketing_words = [
-        "CLOUD", "FUTURE", "INNOVATE", "DREAM", "BUILD", "CREATE", "LAUNCH", "FLY",
-        "SPARK", "SHINE", "GLOW", "RISE", "LEAP", "JUMP", "DASH", "ZOOM",
-        "POWER", "MAGIC", "WONDER", "AMAZE", "THRILL", "EXCITE", "INSPIRE", "IGNITE",
-        "ROCKET", "STAR", "MOON", "SUN", "OCEAN", "MOUNTAIN", "FOREST", "RIVER",
-        "TECH", "AI", "CODE", "DATA", "SMART", "FAST", "SECURE", "TRUST",
-        "FRIEND", "FAMILY", "TEAM", "SQUAD", "CREW", "GANG", "TRIBE", "CLAN"
-    ]
-    
-    # Fun ASCII symbols and characters
-    ascii_symbols = ["!", "@", "#", "$", "%", "&", "*", "+", "=", "?", "~", "^"]
-    
-    # Generate a deterministic but fun password using the commit hash
-    # Handle cases where commit_hash might contain non-hex characters
-    try:
-        if commit_hash != "unknown" and all(c in '0123456789abcdefABCDEF' for c in commit_hash):
-            hash_num = int(commit_hash, 16)
-        else:
-            hash_num = hash(commit_hash)
-    except ValueError:
-        hash_num = hash(commit_hash)
-    random.seed(hash_num)
-    
-    # Pick a random marketing word
-    word = random.choice(marketing_words)
-    
-    # Pick a random ASCII symbol
-    symbol = random.choice(ascii_symbols)
-    
-    # Generate a short number (2-3 digits)
-    number = random.randint(10, 999)
-    
-    # Combine them in a fun way (ASCII only)
-    password = f"{word}{number}{symbol}"
-    
-    # Cache the generated code
-    _generated_hash_code_cache[commit_hash] = password
-    
-    return password
+    return _code_from_hash(commit_hash)
 
-# Add a module-level flag to track if we've already printed the current code
-_current_code_printed = False
-_next_code_printed = False
-
-def get_current_marketing_password():
+def _resolve_current_marketing_password():
     """
-    Get the current live marketing password from database.
+    Resolve the current live marketing password from database.
     This should only change after successful deployment.
     """
-    global _current_code_printed
-    
     try:
         # Try database first (cost-effective)
-        database_connection_string = os.environ.get('DATABASE_CONNECTION_STRING')
-        if database_connection_string:
+        db_client = get_database_client()
+        if db_client:
             try:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection_string)
                 current_code = db_client.get_current_marketing_code()
                 
                 if current_code:
-                    if not _current_code_printed:
-                        print(f"✅ Using database current code: {current_code}")
-                        _current_code_printed = True
+                    logger.debug("Using database current code: %s", current_code)
                     return current_code
                 else:
-                    if not _current_code_printed:
-                        print("⚠️ No current code found in database")
-                        _current_code_printed = True
+                    logger.warning("No current code found in database")
             except Exception as e:
-                if not _current_code_printed:
-                    print(f"❌ Error accessing database: {e}")
-                    _current_code_printed = True
+                logger.error("Error accessing database: %s", e)
     except Exception as e:
-        if not _current_code_printed:
-            print(f"❌ Error setting up database connection: {e}")
-            _current_code_printed = True
+        logger.error("Error setting up database connection: %s", e)
     
     # Fallback to Secret Manager (if database not available)
     try:
-        from scripts.secret_manager_client import SecretManagerClient
-        client = SecretManagerClient(os.environ.get('GOOGLE_CLOUD_PROJECT', 'yourl-cloud'))
+        client = get_secret_manager_client()
         current_code = client.get_current_marketing_code()
         
         if current_code:
-            if not _current_code_printed:
-                print(f"✅ Using Secret Manager current code: {current_code}")
-                _current_code_printed = True
+            logger.debug("Using Secret Manager current code: %s", current_code)
             return current_code
         else:
-            if not _current_code_printed:
-                print("⚠️ No current code found in Secret Manager")
-                _current_code_printed = True
+            logger.warning("No current code found in Secret Manager")
             
     except Exception as e:
-        if not _current_code_printed:
-            print(f"❌ Error accessing Secret Manager: {e}")
-            _current_code_printed = True
+        logger.error("Error accessing Secret Manager: %s", e)
     
     # Fallback to environment variable
     build_password = os.environ.get('BUILD_MARKETING_PASSWORD')
     if build_password:
-        if not _current_code_printed:
-            print(f"✅ Using BUILD_MARKETING_PASSWORD: {build_password}")
-            _current_code_printed = True
+        logger.debug("Using BUILD_MARKETING_PASSWORD: %s", build_password)
         return build_password
     
     # Last resort: generate based on current commit (should not happen in production)
     fallback_code = generate_marketing_password()
-    if not _current_code_printed:
-        print(f"⚠️ Using fallback generated code: {fallback_code}")
-        _current_code_printed = True
+    logger.warning("Using fallback generated code: %s", fallback_code)
     return fallback_code
 
-def get_next_marketing_password():
+def _resolve_next_marketing_password():
     """
-    Get the next marketing password from database.
+    Resolve the next marketing password from database.
     This is what will become the current code after next deployment.
     """
-    global _next_code_printed
-    
     try:
         # Try database first (cost-effective)
-        database_connection_string = os.environ.get('DATABASE_CONNECTION_STRING')
-        if database_connection_string:
+        db_client = get_database_client()
+        if db_client:
             try:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection_string)
                 next_code = db_client.get_next_marketing_code()
                 
                 if next_code:
-                    if not _next_code_printed:
-                        print(f"✅ Using database next code: {next_code}")
-                        _next_code_printed = True
+                    logger.debug("Using database next code: %s", next_code)
                     return next_code
                 else:
-                    if not _next_code_printed:
-                        print("⚠️ No next code found in database")
-                        _next_code_printed = True
+                    logger.warning("No next code found in database")
             except Exception as e:
-                if not _next_code_printed:
-                    print(f"❌ Error accessing database: {e}")
-                    _next_code_printed = True
+                logger.error("Error accessing database: %s", e)
     except Exception as e:
-        if not _next_code_printed:
-            print(f"❌ Error setting up database connection: {e}")
-            _next_code_printed = True
+        logger.error("Error setting up database connection: %s", e)
     
     # Fallback to Secret Manager (if database not available)
     try:
-        from scripts.secret_manager_client import SecretManagerClient
-        client = SecretManagerClient(os.environ.get('GOOGLE_CLOUD_PROJECT', 'yourl-cloud'))
+        client = get_secret_manager_client()
         next_code = client.get_next_marketing_code()
         
         if next_code:
-            if not _next_code_printed:
-                print(f"✅ Using Secret Manager next code: {next_code}")
-                _next_code_printed = True
+            logger.debug("Using Secret Manager next code: %s", next_code)
             return next_code
         else:
-            if not _next_code_printed:
-                print("⚠️ No next code found in Secret Manager")
-                _next_code_printed = True
+            logger.warning("No next code found in Secret Manager")
             
     except Exception as e:
-        if not _next_code_printed:
-            print(f"❌ Error accessing Secret Manager: {e}")
-            _next_code_printed = True
+        logger.error("Error accessing Secret Manager: %s", e)
     
     # Fallback: generate next code based on current commit
-    try:
-        commit_hash = subprocess.check_output(['git', 'rev-parse', 'HEAD'], 
-                                            text=True, stderr=subprocess.DEVNULL).strip()[:8]
-        next_hash = commit_hash + "_next"
-    except:
-        next_hash = "next_unknown"
+    next_hash = f"{_COMMIT_HASH}_next" if _COMMIT_HASH else "next_unknown"
     
     fallback_code = generate_marketing_password_from_hash(next_hash)
-    if not _next_code_printed:
-        print(f"⚠️ Using fallback generated next code: {fallback_code}")
-        _next_code_printed = True
+    logger.warning("Using fallback generated next code: %s", fallback_code)
     return fallback_code
 
+# Live codes are cached in memory and re-resolved after a short TTL so a
+# rotation reaches running instances without a per-request lookup.
+# The /monitoring/cache "rebuild" action forces an immediate refresh.
+MARKETING_CODE_TTL = int(os.environ.get('MARKETING_CODE_TTL', '30'))  # seconds
+# Nothing is resolved at import (no database or Secret Manager calls from tooling,
+# tests or the --preload master); the first request that needs a code loads them.
+_marketing_codes_lock = threading.Lock()
+_current_marketing_password = None
+_next_marketing_password = None
+_marketing_codes_expire_at = 0
+
+def _marketing_codes_are_static():
+    """Without a database or Secret Manager the codes cannot change at runtime"""
+    return get_database_client() is None and SecretManagerClient is None
+
+def _refresh_marketing_passwords():
+    """
+    Re-resolve the cached codes (database, Secret Manager, fallback) on a background thread.
+    Runs holding _marketing_codes_lock, which the thread that started it acquired; releases it when done.
+    """
+    global _current_marketing_password, _next_marketing_password, _marketing_codes_expire_at
+    
+    try:
+        if _marketing_codes_are_static():
+            _marketing_codes_expire_at = float('inf')
+        elif time.monotonic() >= _marketing_codes_expire_at:
+            codes = (_resolve_current_marketing_password(), _resolve_next_marketing_password())
+            if codes != (_current_marketing_password, _next_marketing_password):
+                logger.info("Marketing codes changed: current=%s next=%s", *codes)
+            _current_marketing_password, _next_marketing_password = codes
+            _marketing_codes_expire_at = time.monotonic() + MARKETING_CODE_TTL
+    except Exception as e:
+        logger.error("Refreshing marketing codes failed: %s", e)
+    finally:
+        _marketing_codes_lock.release()
+
+def _load_marketing_passwords():
+    """First use: there is no cached pair to serve yet, so resolve it on this thread"""
+    global _current_marketing_password, _next_marketing_password, _marketing_codes_expire_at
+    
+    with _marketing_codes_lock:
+        if _current_marketing_password is None:
+            _current_marketing_password = _resolve_current_marketing_password()
+            _next_marketing_password = _resolve_next_marketing_password()
+            _marketing_codes_expire_at = time.monotonic() + MARKETING_CODE_TTL
+            logger.info("Serving marketing codes: current=%s next=%s", _current_marketing_password, _next_marketing_password)
+
+def _refresh_marketing_passwords_if_stale():
+    """
+    Start a background refresh of the cached codes once their TTL has passed.
+    The request never waits on the lookups; every thread keeps serving the cached pair meanwhile.
+    """
+    if time.monotonic() < _marketing_codes_expire_at:
+        return
+    if _current_marketing_password is None:
+        _load_marketing_passwords()
+        return
+    if not _marketing_codes_lock.acquire(blocking=False):
+        return
+    try:
+        threading.Thread(target=_refresh_marketing_passwords, name='marketing-code-refresh', daemon=True).start()
+    except Exception:
+        _marketing_codes_lock.release()
+        raise
+
+def get_current_marketing_password():
+    """
+    Get the current live marketing password (cached, refreshed after MARKETING_CODE_TTL).
+    """
+    _refresh_marketing_passwords_if_stale()
+    return _current_marketing_password
+
+def get_next_marketing_password():
+    """
+    Get the next marketing password (cached, refreshed after MARKETING_CODE_TTL).
+    """
+    _refresh_marketing_passwords_if_stale()
+    return _next_marketing_password
+
+def marketing_code_matches(submitted, expected):
+    """
+    Compare a submitted code with a marketing code in constant time.
+    Codes of the wrong length are rejected before the digest comparison.
+    """
+    if not submitted or not expected:
+        return False
+    submitted = submitted.encode()
+    expected = expected.encode()
+    return len(submitted) == len(expected) and hmac.compare_digest(submitted, expected)
+
+def reload_marketing_passwords():
+    """
+    Re-resolve the current and next marketing passwords from their sources.
+    Returns the (current, next) pair now being served.
+    """
+    global _current_marketing_password, _next_marketing_password, _marketing_codes_expire_at
+    
+    with _marketing_codes_lock:
+        _current_marketing_password = _resolve_current_marketing_password()
+        _next_marketing_password = _resolve_next_marketing_password()
+        _marketing_codes_expire_at = time.monotonic() + MARKETING_CODE_TTL
+        logger.info("Reloaded marketing codes: current=%s next=%s", _current_marketing_password, _next_marketing_password)
+        return _current_marketing_password, _next_marketing_password
+
 # Friends and Family Guard Ruleset
 FRIENDS_FAMILY_GUARD = {
     "enabled": True,
@@ -348,9 +562,14 @@ FRIENDS_FAMILY_GUARD = {
     "organization": "Yourl.Cloud Inc."
 }
 
+# Guard values used by request handlers (fixed for the process lifetime)
+_GUARD_ENABLED = FRIENDS_FAMILY_GUARD['enabled']
+_SESSION_ID = FRIENDS_FAMILY_GUARD['session_id']
+_SESSION_ID_SHORT = _SESSION_ID[:8]
+_ORG_NAME = FRIENDS_FAMILY_GUARD['organization']
+
 # Demo configuration for rapid prototyping (replace with proper auth/db for production)
 DEMO_CONFIG = {
-    "password": get_current_marketing_password(),  # Dynamic marketing password that changes with commits
     "connections": [
         {
             "id": 1,
@@ -395,6 +614,51 @@ app.config.update(
     SERVER_NAME=None
 )
 
+# JSON timestamps only need one-second resolution, so each second is
+# formatted once and shared by every request within it
+_iso_second = (0, '')
+
+def utc_iso_now():
+    """Current UTC time as an ISO-8601 string, truncated to the second"""
+    global _iso_second
+    
+    second = int(time.time())
+    cached = _iso_second
+    if cached[0] != second:
+        # Swap in a new tuple so readers never see a mismatched pair
+        cached = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+        _iso_second = cached
+    return cached[1]
+
+@app.before_request
+def capture_request_time():
+    """Take the request timestamp once so handlers share one clock reading"""
+    g.now = datetime.now(timezone.utc)
+    g.now_iso = utc_iso_now()
+
+@app.before_request
+def capture_request_origin():
+    """Resolve the proxied protocol, host and client IP once per request"""
+    g.orig_proto = get_original_protocol()
+    g.orig_host = get_original_host()
+    g.client_ip = get_client_ip()
+    g.base_url = g.orig_proto + '://' + g.orig_host
+
+# Pages that must never come from a browser or proxy cache (they show the live access code)
+_NO_CACHE_ENDPOINTS = frozenset({'main_endpoint'})
+_NO_CACHE_HEADERS = Headers([
+    ('Cache-Control', 'no-cache, no-store, must-revalidate'),
+    ('Pragma', 'no-cache'),
+    ('Expires', '0'),
+])
+
+@app.after_request
+def add_no_cache_headers(response):
+    """Attach the prebuilt no-cache headers to the endpoints that need them"""
+    if request.endpoint in _NO_CACHE_ENDPOINTS:
+        response.headers.update(_NO_CACHE_HEADERS)
+    return response
+
 def get_client_ip():
     """
     Get the real client IP address, handling Cloud Run's X-Forwarded headers.
@@ -422,36 +686,44 @@ def get_original_protocol():
     """
     return request.headers.get('X-Forwarded-Proto', 'https')
 
+# User-Agent keywords for device detection (case-insensitive), one group per
+# device type. "watch" also matches smartwatch / apple watch, and android is
+# already a phone keyword, so tablet only needs tablet and ipad.
+_DEVICE_RE = re.compile(
+    r'(?P<watch>watch|wearable|samsung gear)'
+    r'|(?P<phone>mobile|android|iphone|phone|blackberry)'
+    r'|(?P<tablet>tablet|ipad)',
+    re.I
+)
+
+@functools.lru_cache(maxsize=4096)
 def detect_device_type(user_agent):
     """
     Detect device type based on User-Agent string.
     Returns: 'pc', 'phone', 'tablet', 'watch', 'unknown'
     """
-    ua_lower = user_agent.lower()
-    
-    # Watch detection (blocked for visual inspection)
-    if any(keyword in ua_lower for keyword in ['watch', 'wearable', 'smartwatch', 'apple watch', 'samsung gear']):
-        return 'watch'
-    
-    # Phone detection
-    if any(keyword in ua_lower for keyword in ['mobile', 'android', 'iphone', 'phone', 'blackberry']):
-        return 'phone'
-    
-    # Tablet detection
-    if any(keyword in ua_lower for keyword in ['tablet', 'ipad', 'android']):
-        return 'tablet'
+    # One scan collects every device keyword present; the most specific type
+    # wins regardless of where it appears (watch is blocked for visual inspection)
+    found = {match.lastgroup for match in _DEVICE_RE.finditer(user_agent)}
+    for device in ('watch', 'phone', 'tablet'):
+        if device in found:
+            return device
     
     # Default to PC
     return 'pc'
 
+# Visual inspection access per device type, resolved once from the guard ruleset
+_DEVICE_ALLOWED = {
+    device: (not FRIENDS_FAMILY_GUARD["enabled"]
+             or FRIENDS_FAMILY_GUARD["visual_inspection"].get(f"{device}_allowed", False))
+    for device in ('pc', 'phone', 'tablet', 'watch', 'unknown')
+}
+
 def is_visual_inspection_allowed(device_type):
     """
     Check if visual inspection is allowed for the given device type.
     """
-    if not FRIENDS_FAMILY_GUARD["enabled"]:
-        return True
-    
-    return FRIENDS_FAMILY_GUARD["visual_inspection"].get(f"{device_type}_allowed", False)
+    return _DEVICE_ALLOWED.get(device_type, not _GUARD_ENABLED)
 
 # Secure token management for monitoring endpoint
 MONITORING_SECRET_KEY = os.environ.get('MONITORING_SECRET', 'yourl-cloud-monitoring-2024-secure-key')
@@ -523,6 +795,23 @@ def verify_monitoring_token(token: str) -> dict:
         print(f"⚠️ Token verification error: {e}")
         return {}
 
+def _session_visitor_data(visitor_id):
+    """
+    Visitor data tracked in the session only (no database available).
+    Increments the session visit count.
+    """
+    session_visits = session.get('visit_count', 0) + 1
+    session['visit_count'] = session_visits
+    
+    return {
+        'visitor_id': visitor_id,
+        'tracking_key': None,
+        'last_access_code': session.get('last_access_code'),
+        'total_visits': session_visits,
+        'is_new_visitor': session_visits == 1,
+        'has_used_code': session.get('authenticated', False)
+    }
+
 def get_visitor_data():
     """
     Get visitor tracking data for the current request.
@@ -530,62 +819,44 @@ def get_visitor_data():
     FIXED: Properly increments visit count and handles database operations.
     """
     try:
-        # Get visitor ID from session or generate one
-        visitor_id = request.cookies.get('visitor_id')
-        if not visitor_id:
-            import uuid
-            visitor_id = str(uuid.uuid4())
+        # Visitor ID comes from the cookie or is generated
+        visitor_id = request.cookies.get('visitor_id') or str(uuid.uuid4())
         
-        # Check for session-based authentication (for when database is not available)
-        session_authenticated = session.get('authenticated', False)
-        session_access_code = session.get('last_access_code')
+        # No database configured - go straight to session-based tracking
+        db_client = get_database_client()
+        if not db_client:
+            return _session_visitor_data(visitor_id)
         
-        # Try to get database connection with timeout protection
-        database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-        if database_connection:
-            try:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection)
-                
-                # Get or create visitor record - FIXED to properly return updated visit count
-                visitor = db_client.get_or_create_visitor(
-                    visitor_id=visitor_id,
-                    user_agent=request.headers.get('User-Agent'),
-                    ip_address=get_client_ip(),
-                    device_type=detect_device_type(request.headers.get('User-Agent', ''))
-                )
-            
-                if visitor:
-                    # FIXED: Ensure we get the updated visit count after increment
-                    total_visits = visitor.get('total_visits', 1)
-                    return {
-                        'visitor_id': visitor.get('visitor_id'),
-                        'tracking_key': visitor.get('public_tracking_key'),
-                        'last_access_code': visitor.get('last_access_code'),
-                        'total_visits': total_visits,
-                        'is_new_visitor': total_visits == 1,
-                        'has_used_code': visitor.get('last_access_code') is not None
-                    }
-            except Exception as e:
-                # Database connection failed - fall through to session-based fallback
-                print(f"⚠️ Database visitor tracking failed: {e}")
-                pass
+        try:
+            # Get or create visitor record - FIXED to properly return updated visit count
+            user_agent = request.headers.get('User-Agent')
+            visitor = db_client.get_or_create_visitor(
+                visitor_id=visitor_id,
+                user_agent=user_agent,
+                ip_address=get_client_ip(),
+                device_type=detect_device_type(user_agent or '')
+            )
         
-        # Fallback if database not available - use session data with proper counting
-        session_visits = session.get('visit_count', 0) + 1
-        session['visit_count'] = session_visits
+            if visitor:
+                # FIXED: Ensure we get the updated visit count after increment
+                total_visits = visitor.get('total_visits', 1)
+                return {
+                    'visitor_id': visitor.get('visitor_id'),
+                    'tracking_key': visitor.get('public_tracking_key'),
+                    'last_access_code': visitor.get('last_access_code'),
+                    'total_visits': total_visits,
+                    'is_new_visitor': total_visits == 1,
+                    'has_used_code': visitor.get('last_access_code') is not None
+                }
+        except Exception as e:
+            # Database connection failed - fall through to session-based fallback
+            logger.warning("Database visitor tracking failed: %s", e)
         
-        return {
-            'visitor_id': visitor_id,
-            'tracking_key': None,
-            'last_access_code': session_access_code,
-            'total_visits': session_visits,
-            'is_new_visitor': session_visits == 1,
-            'has_used_code': session_authenticated
-        }
+        # Fallback if the database lookup failed - use session data with proper counting
+        return _session_visitor_data(visitor_id)
         
     except Exception as e:
-        print(f"⚠️ Error getting visitor data: {e}")
+        logger.warning("Error getting visitor data: %s", e)
         return {
             'visitor_id': request.cookies.get('visitor_id', 'unknown'),
             'tracking_key': None,
@@ -595,6 +866,47 @@ def get_visitor_data():
             'has_used_code': session.get('authenticated', False)
         }
 
+# The landing template is baked into the image, so check for it once
+_HAS_INDEX_TEMPLATE = os.path.isfile(os.path.join(app.root_path, 'templates', 'index.html'))
+
+# Landing page used when templates/index.html is not deployed
+_FALLBACK_TPL = Template("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Yourl.Cloud - URL API Server</title>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1">
+            <link rel="stylesheet" href="/static/fallback.css">
+        </head>
+        <body>
+            <div class="container">
+                <h1>🚀 Yourl.Cloud</h1>
+                <div class="info">
+                    <strong>URL API Server with Visual Inspection</strong><br>
+                    Production-ready Flask application with security features.<br>
+                    <strong>Domain:</strong> $host<br>
+                    <strong>Protocol:</strong> $proto
+                </div>
+                <form method="POST">
+                    <div class="form-group">
+                        <label for="password">🎯 Marketing Password:</label>
+                        <input type="text" id="password" name="password" placeholder="Enter the fun marketing password" value="" required>
+                    </div>
+                    <button type="submit">🚀 Launch Experience</button>
+                </form>
+                <div class="password-display">
+                    <strong>🎪 Current Marketing Password:</strong> $current_password
+                </div>
+                <div class="info">
+                    <strong>Health Check:</strong> <a href="/health">/health</a><br>
+                    <strong>Status:</strong> <a href="/status">/status</a>
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
 @app.route('/', methods=['GET', 'POST'])
 def main_endpoint():
     """
@@ -609,12 +921,9 @@ def main_endpoint():
         visitor_data = get_visitor_data()
         
         # Enhance visitor data with access history if available
-        database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-        if visitor_data.get('visitor_id') and database_connection:
+        db_client = get_database_client()
+        if visitor_data.get('visitor_id') and db_client:
             try:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection)
-                
                 # Try to get visitor access history
                 try:
                     access_history = db_client.get_visitor_access_history(visitor_data['visitor_id'], limit=10)
@@ -649,234 +958,68 @@ def main_endpoint():
                     'total_attempts': 0
                 })
         
-        # Create response with no-cache headers to ensure fresh content
-        if os.path.exists('templates/index.html'):
-            response = make_response(render_template('index.html', 
-                                                 marketing_code=current_password,
-                                                 visitor_data=visitor_data))
-        else:
-            response = make_response(f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Yourl.Cloud - URL API Server</title>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1">
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-                .container {{ max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                h1 {{ color: #333; text-align: center; }}
-                .form-group {{ margin: 20px 0; }}
-                label {{ display: block; margin-bottom: 5px; font-weight: bold; }}
-                input[type="text"], input[type="password"] {{ width: 100%; padding: 10px; border: 1px solid #ddd; border-radius: 5px; font-size: 16px; }}
-                button {{ background: #007bff; color: white; padding: 12px 30px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; }}
-                button:hover {{ background: #0056b3; }}
-                .info {{ background: #e7f3ff; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                .password-display {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 10px; border-radius: 5px; margin: 10px 0; text-align: center; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>🚀 Yourl.Cloud</h1>
-                <div class="info">
-                    <strong>URL API Server with Visual Inspection</strong><br>
-                    Production-ready Flask application with security features.<br>
-                    <strong>Domain:</strong> {get_original_host()}<br>
-                    <strong>Protocol:</strong> {get_original_protocol()}
-                </div>
-                <form method="POST">
-                    <div class="form-group">
-                        <label for="password">🎯 Marketing Password:</label>
-                        <input type="text" id="password" name="password" placeholder="Enter the fun marketing password" value="" required>
-                    </div>
-                    <button type="submit">🚀 Launch Experience</button>
-                </form>
-                <div class="password-display">
-                    <strong>🎪 Current Marketing Password:</strong> {current_password}
-                </div>
-                <div class="info">
-                    <strong>Health Check:</strong> <a href="/health">/health</a><br>
-                    <strong>Status:</strong> <a href="/status">/status</a>
-                </div>
-            </div>
-        </body>
-        </html>
-        """)
-        
-        # Add cache control headers to prevent browser caching
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        return response
+        # No-cache headers are added by add_no_cache_headers
+        if _HAS_INDEX_TEMPLATE:
+            return render_template('index.html',
+                                   marketing_code=current_password,
+                                   visitor_data=visitor_data)
+        return _FALLBACK_TPL.substitute(
+            host=g.orig_host,
+            proto=g.orig_proto,
+            current_password=current_password
+        )
     
     elif request.method == 'POST':
         # Handle authentication with simple password check
         password = request.form.get('password', '')
         current_password = get_current_marketing_password()
         
-        if password == current_password:
+        if marketing_code_matches(password, current_password):
             # Set session-based authentication (for when database is not available)
             session['authenticated'] = True
             session['last_access_code'] = current_password
             
-            # Get the next code for authenticated users (Cursor ownership)
-            next_password = get_next_marketing_password()
-            
-            # Log successful authentication to database if available
-            try:
-                database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-                if database_connection:
-                    from scripts.database_client import DatabaseClient
-                    db_client = DatabaseClient(database_connection)
-                    
-                    # Log usage
-                    db_client.log_usage(current_password, request.headers.get('User-Agent'), 
-                                      get_client_ip(), '/auth', True)
-                    
-                    # Log visitor access
-                    visitor_id = request.cookies.get('visitor_id')
-                    if visitor_id:
-                        db_client.log_visitor_access(
-                            visitor_id=visitor_id,
-                            access_code=current_password,
-                            success=True,
-                            user_agent=request.headers.get('User-Agent'),
-                            ip_address=get_client_ip()
-                        )
-            except Exception as e:
-                print(f"⚠️ Database logging failed: {e}")
-            
-            # Get current build version/commit hash
-            try:
-                build_version = subprocess.check_output(['git', 'rev-parse', 'HEAD'], 
-                                                     text=True, stderr=subprocess.DEVNULL).strip()[:8]
-            except:
-                build_version = "unknown"
+            # Shared database client (None when no database is configured)
+            db_client = get_database_client()
             
             # Get visitor data for personalization
             visitor_data = get_visitor_data()
             visitor_id = visitor_data.get('visitor_id', 'unknown')
             
-            # Store landing page version in SQL if database is available
-            landing_page_version = None
+            # Log the authentication and landing page version to database if available
+            # (one transaction, written in the background)
             try:
-                database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-                if database_connection:
-                    from scripts.database_client import DatabaseClient
-                    db_client = DatabaseClient(database_connection)
-                    
-                    # Store landing page version
-                    landing_page_url = f"{get_original_protocol()}://{get_original_host()}/"
-                    db_client.store_landing_page_version(
-                        visitor_id=visitor_id,
-                        landing_page_url=landing_page_url,
-                        build_version=build_version,
-                        marketing_code=current_password
-                    )
-                    
-                    # Get visitor's landing page history for personalization
-                    landing_page_version = db_client.get_landing_page_version(visitor_id)
+                if db_client:
+                    queue_db_write('log_auth_batch',
+                                   code=current_password,
+                                   landing_visitor_id=visitor_id,
+                                   landing_page_url=g.base_url + "/",
+                                   build_version=BUILD_VERSION,
+                                   visitor_id=request.cookies.get('visitor_id'),
+                                   user_agent=request.headers.get('User-Agent'),
+                                   ip_address=g.client_ip,
+                                   endpoint='/auth')
             except Exception as e:
-                print(f"⚠️ Database logging failed: {e}")
-                landing_page_version = None
+                logger.warning("Database logging failed: %s", e)
             
-            # Create personalized response based on visitor data
+            # Personalize the experience
             is_new_visitor = visitor_data.get('is_new_visitor', True)
             has_used_code = visitor_data.get('has_used_code', False)
-            total_visits = visitor_data.get('total_visits', 1)
-            
-            # Personalize the experience
             if is_new_visitor:
-                welcome_message = "🎉 Welcome to Yourl.Cloud! This is your first visit!"
                 experience_level = "new_user"
             elif has_used_code:
-                welcome_message = f"🎯 Welcome back! This is visit #{total_visits} and you've successfully used a code before!"
                 experience_level = "returning_user"
             else:
-                welcome_message = f"👋 Welcome back! This is visit #{total_visits}!"
                 experience_level = "returning_visitor"
             
-            # Create JSON response with actual URL and personalized data
-            json_response = {
-                "status": "authenticated",
-                "message": welcome_message,
-                "experience_level": experience_level,
-                "visitor_data": {
-                    "visitor_id": visitor_id,
-                    "total_visits": total_visits,
-                    "is_new_visitor": is_new_visitor,
-                    "has_used_code": has_used_code,
-                    "tracking_key": visitor_data.get('tracking_key')
-                },
-                "landing_page": {
-                    "url": f"{get_original_protocol()}://{get_original_host()}/",
-                    "build_version": build_version,
-                    "marketing_code": current_password
-                },
-                "current_marketing_password": current_password,
-                "next_marketing_password": next_password,
-                "ownership": {
-                    "perplexity": "current_marketing_password",
-                    "cursor": "next_marketing_password"
-                },
-                "navigation": {
-                    "back_to_landing": f"{get_original_protocol()}://{get_original_host()}/",
-                    "api_endpoint": f"{get_original_protocol()}://{get_original_host()}/api",
-                    "status_page": f"{get_original_protocol()}://{get_original_host()}/status"
-                },
-                "timestamp": datetime.utcnow().isoformat(),
-                "organization": FRIENDS_FAMILY_GUARD["organization"]
-            }
-            
-            # Add landing page version history if available
-            if landing_page_version:
-                json_response["landing_page"]["version_history"] = {
-                    "first_accessed": landing_page_version.get('first_accessed_at'),
-                    "last_accessed": landing_page_version.get('last_accessed_at'),
-                    "access_count": landing_page_version.get('access_count'),
-                    "previous_url": landing_page_version.get('landing_page_url')
-                }
-            
-            # Instead of returning HTML directly, redirect to prevent form resubmission
-            # Store authentication data in session for the redirected page
-            session['auth_data'] = {
-                'welcome_message': welcome_message,
-                'experience_level': experience_level,
-                'visitor_data': {
-                    'visitor_id': visitor_id,
-                    'total_visits': total_visits,
-                    'is_new_visitor': is_new_visitor,
-                    'has_used_code': has_used_code,
-                    'tracking_key': visitor_data.get('tracking_key')
-                },
-                'landing_page': {
-                    'url': f"{get_original_protocol()}://{get_original_host()}/",
-                    'build_version': build_version,
-                    'marketing_code': current_password
-                },
-                'current_marketing_password': current_password,
-                'next_marketing_password': next_password,
-                'ownership': {
-                    'perplexity': 'current_marketing_password',
-                    'cursor': 'next_marketing_password'
-                },
-                'navigation': {
-                    'back_to_landing': f"{get_original_protocol()}://{get_original_host()}/",
-                    'api_endpoint': f"{get_original_protocol()}://{get_original_host()}/api",
-                    'status_page': f"{get_original_protocol()}://{get_original_host()}/status"
-                },
-                'timestamp': datetime.utcnow().isoformat(),
-                'organization': FRIENDS_FAMILY_GUARD["organization"]
-            }
-            
-            # Add landing page version history if available
-            if landing_page_version:
-                session['auth_data']["landing_page"]["version_history"] = {
-                    'first_accessed': landing_page_version.get('first_accessed_at'),
-                    'last_accessed': landing_page_version.get('last_accessed_at'),
-                    'access_count': landing_page_version.get('access_count'),
-                    'previous_url': landing_page_version.get('landing_page_url')
-                }
+            # Instead of returning HTML directly, redirect to prevent form resubmission.
+            # The authenticated page reads these flat session fields.
+            session['auth_experience_level'] = experience_level
+            session['auth_visitor_id'] = visitor_id
+            session['auth_total_visits'] = visitor_data.get('total_visits', 1)
+            session['auth_is_new_visitor'] = is_new_visitor
+            session['auth_has_used_code'] = has_used_code
+            session['auth_tracking_key'] = visitor_data.get('tracking_key')
             
             # Check if there's a redirect after auth and use it, otherwise go to authenticated page
             redirect_url = session.pop('redirect_after_auth', '/authenticated')
@@ -896,19 +1039,18 @@ def get_request_url():
     # Get request information with Cloud Run header support
     url = request.url
     method = request.method
-    headers = dict(request.headers)
-    user_agent = headers.get('User-Agent', 'Unknown')
+    user_agent = request.headers.get('User-Agent', 'Unknown')
     device_type = detect_device_type(user_agent)
     
     # Get Cloud Run specific information
-    client_ip = get_client_ip()
-    original_host = get_original_host()
-    original_protocol = get_original_protocol()
+    client_ip = g.client_ip
+    original_host = g.orig_host
+    original_protocol = g.orig_proto
     
     # Check if visual inspection is allowed
     if is_visual_inspection_allowed(device_type):
         # Return HTML for allowed devices
-        return render_visual_inspection(url, device_type, datetime.utcnow(), original_host, original_protocol)
+        return render_visual_inspection(url, device_type, g.now, original_host, original_protocol)
     else:
         # Return JSON for blocked devices (like watches)
         return jsonify({
@@ -916,9 +1058,9 @@ def get_request_url():
             "method": method,
             "device_type": device_type,
             "visual_inspection": "blocked",
-            "timestamp": datetime.utcnow().isoformat(),
-            "friends_family_guard": FRIENDS_FAMILY_GUARD["enabled"],
-            "organization": FRIENDS_FAMILY_GUARD["organization"],
+            "timestamp": g.now_iso,
+            "friends_family_guard": _GUARD_ENABLED,
+            "organization": _ORG_NAME,
             "cloud_run": {
                 "client_ip": client_ip,
                 "original_host": original_host,
@@ -927,218 +1069,108 @@ def get_request_url():
             }
         })
 
+_URL_MARKER = '\x00url\x00'
+_TIME_MARKER = '\x00timestamp\x00'
+
+class _MarkerTime:
+    """Stands in for the request time so the template renders a splice point instead"""
+    def strftime(self, fmt):
+        return _TIME_MARKER
+
+@functools.lru_cache(maxsize=32)
+def _render_inspection_skeleton(device_type, original_host, original_protocol):
+    """
+    Render the visual inspection page once per (device, host, protocol) combination.
+    Returns (head, middle, tail) split around the request URL and the timestamp,
+    which are the only parts that change between requests.
+    """
+    html = render_template('visual_inspection.html',
+                           url=_URL_MARKER,
+                           device_type=device_type,
+                           timestamp=_MarkerTime(),
+                           original_host=original_host,
+                           original_protocol=original_protocol,
+                           session_id=_SESSION_ID,
+                           session_id_short=_SESSION_ID_SHORT,
+                           organization=_ORG_NAME)
+    head, rest = html.split(_URL_MARKER)
+    middle, tail = rest.split(_TIME_MARKER)
+    return head, middle, tail
+
 def render_visual_inspection(url, device_type, timestamp, original_host, original_protocol):
     """
     Render the visual inspection interface for allowed devices.
     Enhanced for Cloud Run domain mapping compatibility.
+    The page refreshes itself every 30 seconds via the Refresh header and may be
+    served from the browser cache in between.
     """
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Yourl.Cloud - Visual Inspection</title>
-        <style>
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                color: #333;
-            }}
-            .container {{
-                max-width: 800px;
-                margin: 0 auto;
-                background: white;
-                border-radius: 15px;
-                box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-                overflow: hidden;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #007bff, #0056b3);
-                color: white;
-                padding: 30px;
-                text-align: center;
-            }}
-            .header h1 {{
-                margin: 0;
-                font-size: 2.5em;
-                font-weight: 300;
-            }}
-            .content {{
-                padding: 30px;
-            }}
-            .url-display {{
-                background: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 20px;
-                margin: 20px 0;
-                word-break: break-all;
-                font-family: 'Courier New', monospace;
-                font-size: 14px;
-            }}
-            .info-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 20px;
-                margin: 30px 0;
-            }}
-            .info-card {{
-                background: #f8f9fa;
-                border-radius: 10px;
-                padding: 20px;
-                border-left: 4px solid #007bff;
-            }}
-            .info-card h3 {{
-                margin: 0 0 10px 0;
-                color: #007bff;
-            }}
-            .status-badge {{
-                display: inline-block;
-                padding: 5px 15px;
-                border-radius: 20px;
-                font-size: 12px;
-                font-weight: bold;
-                text-transform: uppercase;
-            }}
-            .status-success {{
-                background: #d4edda;
-                color: #155724;
-            }}
-            .status-info {{
-                background: #d1ecf1;
-                color: #0c5460;
-            }}
-            .refresh-btn {{
-                background: linear-gradient(135deg, #007bff, #0056b3);
-                color: white;
-                border: none;
-                padding: 12px 30px;
-                border-radius: 25px;
-                cursor: pointer;
-                font-size: 16px;
-                transition: transform 0.2s;
-            }}
-            .refresh-btn:hover {{
-                transform: translateY(-2px);
-            }}
-            .footer {{
-                background: #f8f9fa;
-                padding: 20px;
-                text-align: center;
-                border-top: 1px solid #e9ecef;
-            }}
-            @media (max-width: 768px) {{
-                .container {{
-                    margin: 10px;
-                    border-radius: 10px;
-                }}
-                .header h1 {{
-                    font-size: 2em;
-                }}
-                .content {{
-                    padding: 20px;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔍 Visual Inspection</h1>
-                <p>Yourl.Cloud URL API Server - Real-time Monitoring</p>
-            </div>
-            
-            <div class="content">
-                <div class="url-display">
-                    <strong>Request URL:</strong><br>
-                    {url}
-                </div>
-                
-                <div class="info-grid">
-                    <div class="info-card">
-                        <h3>📱 Device Information</h3>
-                        <p><strong>Type:</strong> {device_type.title()}</p>
-                        <p><strong>Status:</strong> <span class="status-badge status-success">Allowed</span></p>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>🛡️ Security Status</h3>
-                        <p><strong>Guard:</strong> <span class="status-badge status-success">Enabled</span></p>
-                        <p><strong>Inspection:</strong> <span class="status-badge status-info">Active</span></p>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>⏰ Timestamp</h3>
-                        <p><strong>Time:</strong> {timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-                        <p><strong>Session:</strong> {FRIENDS_FAMILY_GUARD['session_id'][:8]}...</p>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>🏢 Organization</h3>
-                        <p><strong>Company:</strong> {FRIENDS_FAMILY_GUARD['organization']}</p>
-                        <p><strong>Environment:</strong> <span class="status-badge status-success">Production</span></p>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>☁️ Cloud Run Info</h3>
-                        <p><strong>Domain:</strong> {original_host}</p>
-                        <p><strong>Protocol:</strong> {original_protocol}</p>
-                        <p><strong>Mapping:</strong> <span class="status-badge status-success">Enabled</span></p>
-                    </div>
-                </div>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <button class="refresh-btn" onclick="location.reload()">
-                        🔄 Refresh Data
-                    </button>
-                </div>
-            </div>
-            
-            <div class="footer">
-                <p><strong>Yourl.Cloud</strong> - Secure URL API Server with Visual Inspection</p>
-                <p>Session: {FRIENDS_FAMILY_GUARD['session_id']} | Organization: {FRIENDS_FAMILY_GUARD['organization']}</p>
-            </div>
-        </div>
-        
-        <script>
-            // Auto-refresh every 30 seconds
-            setTimeout(function() {{
-                location.reload();
-            }}, 30000);
-        </script>
-    </body>
-    </html>
-    """
-    return html_content
+    head, middle, tail = _render_inspection_skeleton(device_type, original_host, original_protocol)
+    response = make_response(head + str(escape(url)) + middle
+                             + timestamp.strftime('%Y-%m-%d %H:%M:%S UTC') + tail)
+    response.headers['Refresh'] = '30'
+    response.headers['Cache-Control'] = 'private, max-age=25'
+    return response
+
+def _json_prefix(static_fields):
+    """Serialize constant response fields once, leaving the object open for per-request fields"""
+    return json.dumps(static_fields, separators=(',', ':'))[:-1]
+
+def _json_with_prefix(prefix, dynamic_fields):
+    """Close a pre-serialized JSON prefix with the per-request fields"""
+    body = prefix + ',' + json.dumps(dynamic_fields, separators=(',', ':'))[1:]
+    return Response(body, mimetype='application/json')
+
+_WSGI_SERVER = "waitress" if platform.system() == "Windows" else "gunicorn"
+
+# Constant parts of the /health and /status payloads, serialized at import
+_HEALTH_PREFIX = _json_prefix({
+    "status": "healthy",
+    "service": "url-api",
+    "version": "1.0.0",
+    "friends_family_guard": FRIENDS_FAMILY_GUARD["enabled"],
+    "cloud_run_support": True,
+    "domain_mapping": {
+        "enabled": CLOUD_RUN_CONFIG["domain_mapping_enabled"],
+        "region": CLOUD_RUN_CONFIG["region"],
+        "health_check_path": CLOUD_RUN_CONFIG["health_check_path"]
+    },
+    "wsgi_server": _WSGI_SERVER,
+    "production_mode": True,
+    "deployment_model": "all_instances_production"
+})
+
+_STATUS_PREFIX = _json_prefix({
+    "service": "URL API with Visual Inspection",
+    "version": "1.0.0",
+    "status": "running",
+    "session_id": FRIENDS_FAMILY_GUARD["session_id"],
+    "organization": FRIENDS_FAMILY_GUARD["organization"],
+    "friends_family_guard": FRIENDS_FAMILY_GUARD["enabled"],
+    "visual_inspection": FRIENDS_FAMILY_GUARD["visual_inspection"],
+    "cloud_run_support": True,
+    "demo_mode": True,
+    "wsgi_server": _WSGI_SERVER,
+    "production_mode": True,
+    "deployment_model": "all_instances_production"
+})
+
+# User-Agent prefixes of automated health probes (Kubernetes/Cloud Run, Google health checks)
+_HEALTH_PROBE_AGENTS = ('kube-probe', 'GoogleHC')
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """
     Health check endpoint for Cloud Run domain mapping compatibility.
     This endpoint is used by Cloud Run for health checks and domain mapping validation.
+    Automated probes only need the status code, so they get an empty 200.
     """
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "url-api",
-        "version": "1.0.0",
-        "friends_family_guard": FRIENDS_FAMILY_GUARD["enabled"],
-        "cloud_run_support": True,
-        "domain_mapping": {
-            "enabled": CLOUD_RUN_CONFIG["domain_mapping_enabled"],
-            "region": CLOUD_RUN_CONFIG["region"],
-            "health_check_path": CLOUD_RUN_CONFIG["health_check_path"]
-        },
-        "wsgi_server": "waitress" if platform.system() == "Windows" else "gunicorn",
-        "production_mode": True,
-        "deployment_model": "all_instances_production",
+    if request.headers.get('User-Agent', '').startswith(_HEALTH_PROBE_AGENTS):
+        return Response(status=200)
+    return _json_with_prefix(_HEALTH_PREFIX, {
+        "timestamp": g.now_iso,
         "port": PORT,
-        "host": get_original_host(),
-        "protocol": get_original_protocol()
+        "host": g.orig_host,
+        "protocol": g.orig_proto
     })
 
 @app.route('/status', methods=['GET'])
@@ -1147,28 +1179,17 @@ def status():
     Status endpoint with service information.
     Enhanced for Cloud Run domain mapping compatibility.
     """
-    return jsonify({
-        "service": "URL API with Visual Inspection",
-        "version": "1.0.0",
-        "status": "running",
+    original_host = g.orig_host
+    return _json_with_prefix(_STATUS_PREFIX, {
         "port": PORT,
-        "host": get_original_host(),
-        "timestamp": datetime.utcnow().isoformat(),
-        "session_id": FRIENDS_FAMILY_GUARD["session_id"],
-        "organization": FRIENDS_FAMILY_GUARD["organization"],
-        "friends_family_guard": FRIENDS_FAMILY_GUARD["enabled"],
-        "visual_inspection": FRIENDS_FAMILY_GUARD["visual_inspection"],
-        "cloud_run_support": True,
-        "demo_mode": True,
-        "wsgi_server": "waitress" if platform.system() == "Windows" else "gunicorn",
-        "production_mode": True,
-        "deployment_model": "all_instances_production",
+        "host": original_host,
+        "timestamp": g.now_iso,
         "domain_mapping": {
             "enabled": CLOUD_RUN_CONFIG["domain_mapping_enabled"],
             "region": CLOUD_RUN_CONFIG["region"],
-            "original_host": get_original_host(),
-            "original_protocol": get_original_protocol(),
-            "client_ip": get_client_ip()
+            "original_host": original_host,
+            "original_protocol": g.orig_proto,
+            "client_ip": g.client_ip
         }
     })
 
@@ -1179,248 +1200,99 @@ def guard_status():
     """
     return jsonify({
         "friends_family_guard": FRIENDS_FAMILY_GUARD,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": g.now_iso
     })
 
-@app.route('/data', methods=['GET'])
-def data_stream():
-    """
-    Wiki Visualization Dashboard - Interactive exploration of Yourl.Cloud's purpose and architecture.
-    This endpoint provides a comprehensive visualization of the project's wiki content,
-    helping users understand the project's purpose through an interactive datastream interface.
-    """
-    # Get visitor data for personalization
-    visitor_data = get_visitor_data()
-    
-    # Create comprehensive wiki sections that represent the project's purpose
-    wiki_sections = [
-        {
-            "id": "1",
-            "title": "Project Overview",
-            "description": "Core mission and vision of Yourl.Cloud",
-            "content": "Yourl.Cloud is a production-ready Python Flask API designed for trust-based AI systems. The platform provides advanced features including Cloud Run domain mapping compatibility, Friends and Family Guard security rulesets, visual inspection capabilities, and production WSGI server support.",
-            "category": "overview",
-            "status": "featured",
-            "lastUpdate": datetime.now() - timedelta(minutes=5),
-            "links": ["Architecture Overview", "Security Features", "Technology Stack"]
-        },
-        {
-            "id": "2",
-            "title": "Architecture Overview",
-            "description": "Complete system architecture and design",
-            "content": "The system is built with Python Flask 3.0.2, WSGI servers (Gunicorn/Waitress), Google Cloud Run deployment, and comprehensive security layers including authentication, authorization, encryption, and audit trails.",
-            "category": "architecture",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=3),
-            "links": ["Technology Stack", "Security Architecture", "Deployment Guide"]
-        },
-        {
-            "id": "3",
-            "title": "Security Features",
-            "description": "Friends and Family Guard security ruleset",
-            "content": "Implements comprehensive security with device-based access control, multi-factor authentication, role-based authorization, complete audit logging, and compliance with GDPR, SOC 2, and ISO 27001 standards.",
-            "category": "security",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=2),
-            "links": ["Security Checklist", "Access Control", "Audit & Compliance"]
-        },
-        {
-            "id": "4",
-            "title": "Development Workflow",
-            "description": "Development process and best practices",
-            "content": "Comprehensive development workflow including local development setup, testing procedures, code standards, CI/CD pipeline, and deployment processes with automated testing and security scanning.",
-            "category": "development",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=4),
-            "links": ["Technology Stack", "Deployment Guide", "Testing Procedures"]
-        },
-        {
-            "id": "5",
-            "title": "Cloud Run Deployment",
-            "description": "Production deployment on Google Cloud",
-            "content": "Full Cloud Run compatibility with automatic scaling, domain mapping, load balancing, health monitoring, and disaster recovery with 99.9% uptime target and cross-region failover capabilities.",
-            "category": "deployment",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=1),
-            "links": ["Architecture Overview", "Infrastructure Setup", "Performance Metrics"]
-        },
-        {
-            "id": "6",
-            "title": "Knowledge Hub",
-            "description": "Central documentation and learning center",
-            "content": "Comprehensive knowledge transfer hub serving as the central navigation point for all aspects of the solution, including interactive features, search capabilities, and continuous improvement processes.",
-            "category": "overview",
-            "status": "featured",
-            "lastUpdate": datetime.now() - timedelta(minutes=6),
-            "links": ["Wiki System", "Documentation", "Learning Paths"]
-        },
-        {
-            "id": "7",
-            "title": "Technology Stack",
-            "description": "Complete technology overview and resources",
-            "content": "Modern technology stack including Python 3.11+, Flask 3.0.2, Google Cloud Platform, PostgreSQL, Docker, and comprehensive monitoring and analytics tools.",
-            "category": "architecture",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=8),
-            "links": ["Architecture Overview", "Development Guide", "External Resources"]
-        },
-        {
-            "id": "8",
-            "title": "API Endpoints",
-            "description": "Available API endpoints and usage",
-            "content": "Core endpoints including landing page, authentication, data stream interface, health checks, status monitoring, and device-specific responses with security compliance.",
-            "category": "development",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=10),
-            "links": ["API Documentation", "Authentication", "Security Features"]
-        },
-        {
-            "id": "9",
-            "title": "Performance Metrics",
-            "description": "System performance and optimization",
-            "content": "Performance targets including <200ms response time, 99.9% uptime, 1000+ requests/second throughput, and comprehensive monitoring with real-time alerts and historical trends.",
-            "category": "architecture",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=12),
-            "links": ["Monitoring Guide", "Performance Tuning", "Scaling Strategy"]
-        },
-        {
-            "id": "10",
-            "title": "Data Architecture",
-            "description": "Database design and storage strategy",
-            "content": "Robust data architecture with Google Cloud SQL, automated backups, cross-region replication, audit trails, and comprehensive data protection with encryption and compliance.",
-            "category": "architecture",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=15),
-            "links": ["Database Management", "Backup Strategy", "Data Protection"]
-        },
-        {
-            "id": "11",
-            "title": "Monitoring & Alerting",
-            "description": "System monitoring and health checks",
-            "content": "Comprehensive monitoring including infrastructure metrics, application performance, business analytics, security monitoring, and automated alerting with PagerDump integration.",
-            "category": "deployment",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=18),
-            "links": ["Health Checks", "Performance Metrics", "Alerting System"]
-        },
-        {
-            "id": "12",
-            "title": "Future Roadmap",
-            "description": "Planned features and enhancements",
-            "content": "Future enhancements including microservices architecture, event-driven systems, AI/ML integration, blockchain identity, Kubernetes orchestration, and advanced collaboration tools.",
-            "category": "overview",
-            "status": "planned",
-            "lastUpdate": datetime.now() - timedelta(minutes=20),
-            "links": ["Architecture Evolution", "Technology Roadmap", "Innovation Strategy"]
-        }
-    ]
-    
-    def get_category_icon(category):
-        """Helper function to get category icons"""
-        icons = {
-            'overview': '🎯',
-            'architecture': '🏗️',
-            'security': '🔐',
-            'development': '🚀',
-            'deployment': '🌐'
-        }
-        return icons.get(category, '📚')
-    
-    # Generate dynamic story frames based on current time and visitor data
-    import time
-    current_time = time.time()
-    
-    # Create comprehensive story frames with wiki interpretations
-    story_frames = [
-        {
-            "id": "frame_001",
-            "timestamp": current_time - 3600,  # 1 hour ago
-            "title": "The Trust-Based AI Revolution",
-            "content": "Yourl.Cloud Inc. stands at the forefront of a new era - the Trust-Based AI Revolution. We're not just building technology; we're creating a foundation of trust that enables AI to serve families across locations with integrity and reliability.",
-            "category": "vision_future",
-            "visual_elements": ["ai_trust", "family_bridge", "location_spanning"],
-            "scroll_position": 0,
-            "wiki_links": ["ARCHITECTURE_OVERVIEW.md", "BUSINESS_NAME_UPDATE.md"],
-            "mind_map_nodes": ["trust", "ai", "family", "innovation"]
-        },
-        {
-            "id": "frame_002", 
-            "timestamp": current_time - 1800,  # 30 minutes ago
-            "title": "The Clipboard Bridge Phenomenon",
-            "content": "At cb.yourl.cloud, we've created something extraordinary - a clipboard bridge that transcends physical boundaries. AI assistants can now share context seamlessly across family locations, creating a unified experience that feels like magic.",
-            "category": "breakthrough_technology",
-            "visual_elements": ["clipboard_bridge", "context_sharing", "seamless_experience"],
-            "scroll_position": 100,
-            "wiki_links": ["CLIPBOARD_BRIDGE_DEPLOYMENT.md", "ZAIDO_CLIPBOARD_RECOVERY_GUIDE.md"],
-            "mind_map_nodes": ["clipboard", "bridge", "context", "unified"]
-        },
-        {
-            "id": "frame_003",
-            "timestamp": current_time - 900,  # 15 minutes ago
-            "title": "The Zaido Integration",
-            "content": f"Visitor {visitor_data.get('visitor_id', 'Unknown')} is experiencing the power of Zaido integration. The Windows Focus Enhancer and clipboard tools work in harmony with Yourl.Cloud, creating a productivity ecosystem that adapts to individual needs.",
-            "category": "ecosystem_integration",
-            "visual_elements": ["zaido_tools", "focus_enhancer", "productivity_ecosystem"],
-            "scroll_position": 200,
-            "wiki_links": ["WINDOWS_CLIPBOARD_HISTORY_INTEGRATION.md", "ZAIDO_CLIPBOARD_CONFLICT_RESOLVER.md"],
-            "mind_map_nodes": ["zaido", "integration", "productivity", "focus"]
-        },
-        {
-            "id": "frame_004",
-            "timestamp": current_time - 300,  # 5 minutes ago
-            "title": "The Emergency Response System",
-            "content": "In times of crisis, every second counts. Yourl.Cloud's emergency protocol activates instantly, connecting family members across locations, queuing AI assistants, and ensuring no one faces challenges alone.",
-            "category": "emergency_support",
-            "visual_elements": ["emergency_protocol", "family_connection", "ai_queue"],
-            "scroll_position": 300,
-            "wiki_links": ["SECURITY.md", "EMERGENCY_PROTOCOL.md"],
-            "mind_map_nodes": ["emergency", "response", "family", "support"]
-        },
-        {
-            "id": "frame_005",
-            "timestamp": current_time,
-            "title": "The Real-Time Knowledge Hub",
-            "content": "Knowledge flows like a living river through our system. Every interaction, every decision, every moment contributes to a growing repository of wisdom that guides families toward better outcomes.",
-            "category": "knowledge_evolution",
-            "visual_elements": ["knowledge_river", "living_wisdom", "family_guidance"],
-            "scroll_position": 400,
-            "wiki_links": ["KNOWLEDGE_HUB.md", "WIKI_UPDATE_SYSTEM.md"],
-            "mind_map_nodes": ["knowledge", "wisdom", "guidance", "evolution"]
-        }
-    ]
-    
-    # Add personalized frames based on visitor data
-    if visitor_data.get('has_used_code', False):
-        story_frames.append({
-            "id": "frame_personal",
-            "timestamp": current_time + 60,
-            "title": "The Authenticated Path",
-            "content": f"This visitor has walked the path of authentication. Their journey through the digital landscape has granted them access to deeper layers of the story, revealing secrets hidden in plain sight.",
-            "category": "personal_privilege",
-            "visual_elements": ["authenticated_path", "hidden_secrets", "deeper_layers"],
-            "scroll_position": 500,
-            "wiki_links": ["SECURITY.md", "SECURITY_CHECKLIST.md"],
-            "mind_map_nodes": ["authentication", "security", "access"]
-        })
-    
-    if visitor_data.get('total_visits', 1) > 1:
-        story_frames.append({
-            "id": "frame_returning",
-            "timestamp": current_time + 120,
-            "title": "The Returning Wanderer",
-            "content": f"Like a traveler returning to familiar lands, this visitor has walked these digital paths before. Their {visitor_data.get('total_visits', 1)} visits have woven them into the fabric of this digital story.",
-            "category": "returning_visitor",
-            "visual_elements": ["familiar_lands", "woven_fabric", "digital_story"],
-            "scroll_position": 600,
-            "wiki_links": ["WIKI_UPDATE_SUMMARY.md", "BETA_LAUNCH_SUMMARY.md"],
-            "mind_map_nodes": ["returning", "familiarity", "history"]
-        })
-    
-    # Add knowledge hub frame
-    story_frames.append({
+# Story frames for the /data datastream. Timestamps are stored as offsets from
+# the request time; "content_template" fields are filled from the visitor data.
+_STORY_FRAMES_LEAD = (
+    {
+        "id": "frame_001",
+        "offset": -3600,  # 1 hour ago
+        "title": "The Trust-Based AI Revolution",
+        "content": "Yourl.Cloud Inc. stands at the forefront of a new era - the Trust-Based AI Revolution. We're not just building technology; we're creating a foundation of trust that enables AI to serve families across locations with integrity and reliability.",
+        "category": "vision_future",
+        "visual_elements": ["ai_trust", "family_bridge", "location_spanning"],
+        "scroll_position": 0,
+        "wiki_links": ["ARCHITECTURE_OVERVIEW.md", "BUSINESS_NAME_UPDATE.md"],
+        "mind_map_nodes": ["trust", "ai", "family", "innovation"]
+    },
+    {
+        "id": "frame_002", 
+        "offset": -1800,  # 30 minutes ago
+        "title": "The Clipboard Bridge Phenomenon",
+        "content": "At cb.yourl.cloud, we've created something extraordinary - a clipboard bridge that transcends physical boundaries. AI assistants can now share context seamlessly across family locations, creating a unified experience that feels like magic.",
+        "category": "breakthrough_technology",
+        "visual_elements": ["clipboard_bridge", "context_sharing", "seamless_experience"],
+        "scroll_position": 100,
+        "wiki_links": ["CLIPBOARD_BRIDGE_DEPLOYMENT.md", "ZAIDO_CLIPBOARD_RECOVERY_GUIDE.md"],
+        "mind_map_nodes": ["clipboard", "bridge", "context", "unified"]
+    },
+    {
+        "id": "frame_003",
+        "offset": -900,  # 15 minutes ago
+        "title": "The Zaido Integration",
+        "content_template": "Visitor {visitor_id} is experiencing the power of Zaido integration. The Windows Focus Enhancer and clipboard tools work in harmony with Yourl.Cloud, creating a productivity ecosystem that adapts to individual needs.",
+        "category": "ecosystem_integration",
+        "visual_elements": ["zaido_tools", "focus_enhancer", "productivity_ecosystem"],
+        "scroll_position": 200,
+        "wiki_links": ["WINDOWS_CLIPBOARD_HISTORY_INTEGRATION.md", "ZAIDO_CLIPBOARD_CONFLICT_RESOLVER.md"],
+        "mind_map_nodes": ["zaido", "integration", "productivity", "focus"]
+    },
+    {
+        "id": "frame_004",
+        "offset": -300,  # 5 minutes ago
+        "title": "The Emergency Response System",
+        "content": "In times of crisis, every second counts. Yourl.Cloud's emergency protocol activates instantly, connecting family members across locations, queuing AI assistants, and ensuring no one faces challenges alone.",
+        "category": "emergency_support",
+        "visual_elements": ["emergency_protocol", "family_connection", "ai_queue"],
+        "scroll_position": 300,
+        "wiki_links": ["SECURITY.md", "EMERGENCY_PROTOCOL.md"],
+        "mind_map_nodes": ["emergency", "response", "family", "support"]
+    },
+    {
+        "id": "frame_005",
+        "offset": 0,
+        "title": "The Real-Time Knowledge Hub",
+        "content": "Knowledge flows like a living river through our system. Every interaction, every decision, every moment contributes to a growing repository of wisdom that guides families toward better outcomes.",
+        "category": "knowledge_evolution",
+        "visual_elements": ["knowledge_river", "living_wisdom", "family_guidance"],
+        "scroll_position": 400,
+        "wiki_links": ["KNOWLEDGE_HUB.md", "WIKI_UPDATE_SYSTEM.md"],
+        "mind_map_nodes": ["knowledge", "wisdom", "guidance", "evolution"]
+    }
+)
+
+# Shown once the visitor has authenticated with a code
+_STORY_FRAME_PERSONAL = {
+    "id": "frame_personal",
+    "offset": 60,
+    "title": "The Authenticated Path",
+    "content": "This visitor has walked the path of authentication. Their journey through the digital landscape has granted them access to deeper layers of the story, revealing secrets hidden in plain sight.",
+    "category": "personal_privilege",
+    "visual_elements": ["authenticated_path", "hidden_secrets", "deeper_layers"],
+    "scroll_position": 500,
+    "wiki_links": ["SECURITY.md", "SECURITY_CHECKLIST.md"],
+    "mind_map_nodes": ["authentication", "security", "access"]
+}
+
+# Shown to returning visitors
+_STORY_FRAME_RETURNING = {
+    "id": "frame_returning",
+    "offset": 120,
+    "title": "The Returning Wanderer",
+    "content_template": "Like a traveler returning to familiar lands, this visitor has walked these digital paths before. Their {total_visits} visits have woven them into the fabric of this digital story.",
+    "category": "returning_visitor",
+    "visual_elements": ["familiar_lands", "woven_fabric", "digital_story"],
+    "scroll_position": 600,
+    "wiki_links": ["WIKI_UPDATE_SUMMARY.md", "BETA_LAUNCH_SUMMARY.md"],
+    "mind_map_nodes": ["returning", "familiarity", "history"]
+}
+
+_STORY_FRAMES_TAIL = (
+    {
         "id": "frame_knowledge",
-        "timestamp": current_time + 180,
+        "offset": 180,
         "title": "The Knowledge Hub",
         "content": "At the heart of this digital ecosystem lies the Knowledge Hub - a comprehensive repository of wisdom, experience, and insights that guides every decision and shapes every interaction.",
         "category": "knowledge_management",
@@ -1428,12 +1300,10 @@ def data_stream():
         "scroll_position": 700,
         "wiki_links": ["KNOWLEDGE_HUB.md", "WIKI_UPDATE_SYSTEM.md"],
         "mind_map_nodes": ["knowledge", "wisdom", "insights"]
-    })
-    
-    # Add local development and build testing frame
-    story_frames.append({
+    },
+    {
         "id": "frame_build_testing",
-        "timestamp": current_time + 240,
+        "offset": 240,
         "title": "The Build Testing Phase",
         "content": "Right now, we're in the critical build testing phase. This local instance at localhost:60731 is our proving ground - where we validate every feature, test every integration, and ensure the Yourl.Cloud experience is flawless before deployment.",
         "category": "development_phase",
@@ -1441,441 +1311,244 @@ def data_stream():
         "scroll_position": 800,
         "wiki_links": ["LOCAL_DEVELOPMENT_SETUP.md", "BUILD_COMPLETE.md"],
         "mind_map_nodes": ["build", "testing", "validation", "quality"]
-    })
+    }
+)
+
+@functools.lru_cache(maxsize=None)
+def _display_title(name):
+    """Display form of a story/page identifier, e.g. 'vision_future' -> 'Vision Future'"""
+    return name.replace('_', ' ').title()
+
+def _load_page_template(name):
+    """Read a $-placeholder page (string.Template) from the templates folder"""
+    with open(os.path.join(app.root_path, 'templates', name), encoding='utf-8') as f:
+        return Template(f.read())
+
+def _precompress_page_head(tpl):
+    """
+    gzip-compress the static text in front of a page template's first placeholder once.
+    Returns (head text, compressed head, compressor state after the head).
+    """
+    head = tpl.template[:tpl.pattern.search(tpl.template).start()]
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    return head, compressor.compress(head.encode('utf-8')), compressor
+
+def _gzip_page_chunks(chunks, page_head):
+    """gzip a page's chunks, starting from the precompressed static head"""
+    head, compressed_head, head_compressor = page_head
+    compressor = head_compressor.copy()
+    yield compressed_head
+    chunks = iter(chunks)
+    yield compressor.compress(next(chunks)[len(head):].encode('utf-8'))
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode('utf-8'))
+    yield compressor.flush()
+
+def _page_response(chunks, page_head):
+    """
+    Streamed HTML response for a templated page; the first chunk starts with the page's static head.
+    Clients that accept gzip get it compressed, continuing from the precompressed head.
+    """
+    if request.accept_encodings['gzip']:
+        response = Response(_gzip_page_chunks(chunks, page_head), mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(chunks, mimetype='text/html')
+    response.vary.add('Accept-Encoding')
+    return response
+
+# /data page, loaded once
+_DATA_TPL = _load_page_template('datastream.html')
+_DATA_PAGE_HEAD = _precompress_page_head(_DATA_TPL)
+
+def _datastream_page(frame_sources):
+    """
+    Fill the /data page for a frame set: mind map, frame count and category count.
+    Returns the page up to the frames (a Template for the visitor fields) and the static tail.
+    """
+    nodes = dict.fromkeys(node for frame in frame_sources for node in frame.get('mind_map_nodes', []))
+    mind_map_nodes_html = ''.join(
+        f'<div class="mind-map-node" onclick="filterByNode(\'{node}\')">{_display_title(node)}</div>'
+        for node in nodes)
+    page = _DATA_TPL.safe_substitute(
+        mind_map_nodes_html=mind_map_nodes_html,
+        frame_count=len(frame_sources),
+        category_count=len({frame['category'] for frame in frame_sources}))
+    # Split around the frames, which are streamed in between
+    top, tail = page.split('$frames_html')
+    return Template(top), tail
+
+def _story_frame_set(has_used_code, returning):
+    """Story frames shown to a visitor, with the page template filled for them"""
+    frame_sources = list(_STORY_FRAMES_LEAD)
     
-    # Create the HTML response with wiki visualization
+    # Add personalized frames based on visitor data
+    if has_used_code:
+        frame_sources.append(_STORY_FRAME_PERSONAL)
+    if returning:
+        frame_sources.append(_STORY_FRAME_RETURNING)
     
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Data Stream - Yourl.Cloud Inc.</title>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
-                font-family: 'Courier New', monospace;
-                background: #000;
-                color: #00ff00;
-                overflow-x: auto;
-                overflow-y: hidden;
-            }}
-            .datastream-container {{
-                display: flex;
-                flex-direction: column;
-                min-height: 100vh;
-                width: max-content;
-                padding: 20px;
-            }}
-            .frame {{
-                width: 800px;
-                min-height: 300px;
-                margin: 20px 0;
-                padding: 30px;
-                background: rgba(0, 255, 0, 0.05);
-                border: 1px solid #00ff00;
-                border-radius: 10px;
-                position: relative;
-                overflow: hidden;
-                transition: all 0.3s ease;
-            }}
-            .frame::before {{
-                content: '';
-                position: absolute;
-                top: 0;
-                left: 0;
-                right: 0;
-                height: 2px;
-                background: linear-gradient(90deg, #00ff00, #00aa00, #00ff00);
-                animation: pulse 2s infinite;
-            }}
-            @keyframes pulse {{
-                0% {{ opacity: 0.5; }}
-                50% {{ opacity: 1; }}
-                100% {{ opacity: 0.5; }}
-            }}
-            .frame:hover {{
-                background: rgba(0, 255, 0, 0.1);
-                transform: scale(1.02);
-                box-shadow: 0 0 20px rgba(0, 255, 0, 0.3);
-            }}
-            .frame-header {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 15px;
-                padding-bottom: 10px;
-                border-bottom: 1px solid rgba(0, 255, 0, 0.3);
-            }}
-            .frame-id {{
-                font-weight: bold;
-                color: #00aa00;
-            }}
-            .frame-timestamp {{
-                font-size: 0.9rem;
-                color: #00aa00;
-            }}
-            .frame-category {{
-                display: inline-block;
-                padding: 5px 10px;
-                background: rgba(0, 255, 0, 0.2);
-                border: 1px solid #00ff00;
-                border-radius: 5px;
-                font-size: 0.8rem;
-                margin-bottom: 10px;
-            }}
-            .frame-title {{
-                font-size: 1.5rem;
-                font-weight: bold;
-                margin-bottom: 15px;
-                color: #00ff00;
-            }}
-            .frame-content {{
-                line-height: 1.6;
-                margin-bottom: 20px;
-            }}
-            .visual-elements {{
-                display: flex;
-                flex-wrap: wrap;
-                gap: 10px;
-                margin-bottom: 15px;
-            }}
-            .visual-element {{
-                padding: 5px 10px;
-                background: rgba(0, 255, 0, 0.2);
-                border: 1px solid #00ff00;
-                border-radius: 5px;
-                font-size: 0.8rem;
-            }}
-            .wiki-links {{
-                display: flex;
-                flex-wrap: wrap;
-                gap: 10px;
-                margin-top: 15px;
-                padding-top: 15px;
-                border-top: 1px solid rgba(0, 255, 0, 0.3);
-            }}
-            .wiki-link {{
-                padding: 5px 10px;
-                background: rgba(0, 255, 0, 0.1);
-                border: 1px solid #00ff00;
-                border-radius: 5px;
-                font-size: 0.8rem;
-                text-decoration: none;
-                color: #00ff00;
-                transition: all 0.3s ease;
-            }}
-            .wiki-link:hover {{
-                background: rgba(0, 255, 0, 0.3);
-                transform: scale(1.05);
-            }}
-            .mind-map {{
-                position: fixed;
-                top: 20px;
-                right: 20px;
-                width: 300px;
-                height: 400px;
-                background: rgba(0, 0, 0, 0.9);
-                border: 1px solid #00ff00;
-                border-radius: 10px;
-                padding: 15px;
-                z-index: 1000;
-            }}
-            .mind-map-title {{
-                text-align: center;
-                font-size: 1.2rem;
-                margin-bottom: 15px;
-                color: #00ff00;
-            }}
-            .mind-map-node {{
-                display: inline-block;
-                padding: 5px 10px;
-                background: rgba(0, 255, 0, 0.2);
-                border: 1px solid #00ff00;
-                border-radius: 5px;
-                font-size: 0.8rem;
-                margin: 5px;
-                cursor: pointer;
-                transition: all 0.3s ease;
-            }}
-            .mind-map-node:hover {{
-                background: rgba(0, 255, 0, 0.4);
-                transform: scale(1.1);
-            }}
-            .scroll-indicator {{
-                position: fixed;
-                top: 20px;
-                left: 20px;
-                background: rgba(0, 0, 0, 0.8);
-                padding: 10px;
-                border: 1px solid #00ff00;
-                border-radius: 5px;
-                font-size: 0.9rem;
-            }}
-            .navigation {{
-                position: fixed;
-                bottom: 20px;
-                left: 50%;
-                transform: translateX(-50%);
-                display: flex;
-                gap: 10px;
-            }}
-            .nav-btn {{
-                padding: 10px 20px;
-                background: #00ff00;
-                color: #000;
-                text-decoration: none;
-                border-radius: 5px;
-                font-weight: bold;
-                transition: all 0.3s ease;
-            }}
-            .nav-btn:hover {{
-                background: #00aa00;
-                color: #fff;
-                transform: scale(1.05);
-            }}
-            .visitor-info {{
-                position: fixed;
-                top: 20px;
-                left: 20px;
-                background: rgba(0, 0, 0, 0.8);
-                padding: 15px;
-                border: 1px solid #00ff00;
-                border-radius: 5px;
-                font-size: 0.9rem;
-            }}
-            .data-stream-title {{
-                text-align: center;
-                font-size: 2rem;
-                margin-bottom: 30px;
-                color: #00ff00;
-                text-shadow: 0 0 20px #00ff00;
-            }}
-            .mind-map-container {{
-                display: flex;
-                flex-wrap: wrap;
-                justify-content: center;
-            }}
-            .build-checklist {{
-                position: fixed;
-                bottom: 100px;
-                right: 20px;
-                width: 350px;
-                background: rgba(0, 0, 0, 0.9);
-                border: 1px solid #00ff00;
-                border-radius: 10px;
-                padding: 15px;
-                z-index: 1000;
-            }}
-            .build-checklist h4 {{
-                text-align: center;
-                margin-bottom: 15px;
-                color: #00ff00;
-            }}
-            .checklist-item {{
-                display: flex;
-                align-items: center;
-                margin: 8px 0;
-                padding: 5px;
-                border-radius: 5px;
-                cursor: pointer;
-                transition: all 0.3s ease;
-            }}
-            .checklist-item:hover {{
-                background: rgba(0, 255, 0, 0.1);
-            }}
-            .checklist-item input[type="checkbox"] {{
-                margin-right: 10px;
-                accent-color: #00ff00;
-            }}
-            .checklist-item.completed {{
-                color: #00aa00;
-                text-decoration: line-through;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="visitor-info">
-            <h3>👤 Visitor Data</h3>
-            <p><strong>ID:</strong> {visitor_data.get('visitor_id', 'Unknown')}</p>
-            <p><strong>Visits:</strong> {visitor_data.get('total_visits', 1)}</p>
-            <p><strong>Status:</strong> {'Returning' if not visitor_data.get('is_new_visitor', True) else 'New'}</p>
-            <p><strong>Code Usage:</strong> {'Yes' if visitor_data.get('has_used_code', False) else 'No'}</p>
-            <hr style="border-color: #00ff00; margin: 10px 0;">
-            <h4>🏗️ Build Status</h4>
-            <p><strong>Environment:</strong> Local Development</p>
-            <p><strong>Instance:</strong> localhost:60731</p>
-            <p><strong>Mode:</strong> Build Testing</p>
-            <p><strong>Status:</strong> 🟢 Active</p>
-        </div>
-        
-        <div class="mind-map">
-            <div class="mind-map-title">🧠 Mind Map</div>
-            <div class="mind-map-container">
-                {mind_map_nodes_html}
-            </div>
-        </div>
-        
-        <div class="build-checklist">
-            <h4>✅ Build Testing Checklist</h4>
-            <div class="checklist-item">
-                <input type="checkbox" id="check1" onchange="updateChecklist(this)">
-                <label for="check1">Local server running</label>
-            </div>
-            <div class="checklist-item">
-                <input type="checkbox" id="check2" onchange="updateChecklist(this)">
-                <label for="check2">Data endpoint accessible</label>
-            </div>
-            <div class="checklist-item">
-                <input type="checkbox" id="check3" onchange="updateChecklist(this)">
-                <label for="check3">Story frames displaying</label>
-            </div>
-            <div class="checklist-item">
-                <input type="checkbox" id="check4" onchange="updateChecklist(this)">
-                <label for="check4">Mind map interactive</label>
-            </div>
-            <div class="checklist-item">
-                <input type="checkbox" id="check5" onchange="updateChecklist(this)">
-                <label for="check5">Navigation working</label>
-            </div>
-            <div class="checklist-item">
-                <input type="checkbox" id="check6" onchange="updateChecklist(this)">
-                <label for="check6">Responsive design</label>
-            </div>
-        </div>
-        
-        <div class="scroll-indicator">
-            <p><strong>Scroll Position:</strong> <span id="scrollPos">0</span></p>
-            <p><strong>Frames:</strong> {len(story_frames)}</p>
-            <p><strong>Categories:</strong> {len(set(frame['category'] for frame in story_frames))}</p>
-        </div>
-        
-        <div class="datastream-container">
-            <div class="data-stream-title">🚀 YOURL.CLOUD TRUST-BASED AI DATASTREAM</div>
-            
-            ''' + ''.join(['''
+    # Knowledge hub and build testing frames close the stream
+    frame_sources.extend(_STORY_FRAMES_TAIL)
+    return (tuple(frame_sources), *_datastream_page(frame_sources))
+
+# (frames, page top template, page tail) for each (has_used_code, returning visitor) combination
+_DATASTREAM_PAGES = {
+    (has_used_code, returning): _story_frame_set(has_used_code, returning)
+    for has_used_code in (False, True)
+    for returning in (False, True)
+}
+
+def _story_frame_html_parts(frame):
+    """Pre-render a story frame's HTML, split around its timestamp and content"""
+    html = ('''
             <div class="frame" data-scroll="''' + str(frame['scroll_position']) + '''" data-category="''' + frame['category'] + '''" data-nodes="''' + ','.join(frame.get('mind_map_nodes', [])) + '''">
                 <div class="frame-header">
                     <span class="frame-id">''' + frame['id'] + '''</span>
-                    <span class="frame-timestamp">''' + time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(frame['timestamp'])) + '''</span>
+                    <span class="frame-timestamp">__TIMESTAMP__</span>
                 </div>
-                <div class="frame-category">''' + frame['category'].replace('_', ' ').title() + '''</div>
+                <div class="frame-category">''' + _display_title(frame['category']) + '''</div>
                 <div class="frame-title">''' + frame['title'] + '''</div>
-                <div class="frame-content">''' + frame['content'] + '''</div>
+                <div class="frame-content">__CONTENT__</div>
                 <div class="visual-elements">
-                    ''' + ''.join(['<span class="visual-element">' + element.replace("_", " ").title() + '</span>' for element in frame['visual_elements']]) + '''
+                    ''' + ''.join('<span class="visual-element">' + _display_title(element) + '</span>' for element in frame['visual_elements']) + '''
                 </div>
                 <div class="wiki-links">
-                    ''' + ''.join(['<a href="' + ("/knowledge-hub" if link == "KNOWLEDGE_HUB.md" else "/wiki/" + link) + '" class="wiki-link" target="_blank">📚 ' + link.replace(".md", "").replace("_", " ").title() + '</a>' for link in frame.get('wiki_links', [])]) + '''
+                    ''' + ''.join('<a href="' + ("/knowledge-hub" if link == "KNOWLEDGE_HUB.md" else "/wiki/" + link) + '" class="wiki-link" target="_blank">📚 ' + _display_title(link.replace(".md", "")) + '</a>' for link in frame.get('wiki_links', [])) + '''
                 </div>
             </div>
-            ''' for frame in story_frames]) + '''
-        </div>
-        
-        <div class="navigation">
-            <a href="/" class="nav-btn">🏠 Home</a>
-            <a href="/api" class="nav-btn">🔌 API</a>
-            <a href="/status" class="nav-btn">📊 Status</a>
-            <a href="/data" class="nav-btn">📡 Data Stream</a>
-            <a href="/knowledge-hub" class="nav-btn">🧠 Knowledge Hub</a>
-        </div>
-        
-        <script>
-            // Update scroll position indicator
-            window.addEventListener('scroll', function() {{
-                document.getElementById('scrollPos').textContent = Math.round(window.scrollY);
-            }});
-            
-            // Add hover effects to frames
-            document.querySelectorAll('.frame').forEach(frame => {
-                frame.addEventListener('mouseenter', function() {
-                    this.style.background = 'rgba(0, 255, 0, 0.1)';
-                    this.style.transform = 'scale(1.02)';
-                });
-                
-                frame.addEventListener('mouseleave', function() {
-                    this.style.background = 'rgba(0, 255, 0, 0.05)';
-                    this.style.transform = 'scale(1)';
-                });
-            });
-            
-            // Mind map filtering
-            function filterByNode(node) {
-                const frames = document.querySelectorAll('.frame');
-                frames.forEach(frame => {
-                    const nodes = frame.dataset.nodes.split(',');
-                    if (nodes.includes(node)) {
-                        frame.style.display = 'block';
-                        frame.style.opacity = '1';
-                    } else {
-                        frame.style.opacity = '0.3';
-                    }
-                });
-            }
-            
-            // Auto-scroll animation
-            let scrollSpeed = 0.5;
-            function autoScroll() {
-                window.scrollBy(0, scrollSpeed);
-                requestAnimationFrame(autoScroll);
-            }
-            
-            // Start auto-scroll after 3 seconds
-            setTimeout(() => {
-                autoScroll();
-            }, 3000);
-            
-            // Add keyboard navigation
-            document.addEventListener('keydown', function(e) {
-                switch(e.key) {
-                    case 'ArrowUp':
-                        window.scrollBy(0, -100);
-                        break;
-                    case 'ArrowDown':
-                        window.scrollBy(0, 100);
-                        break;
-                    case 'Home':
-                        window.scrollTo(0, 0);
-                        break;
-                    case 'End':
-                        window.scrollTo(0, document.body.scrollHeight);
-                        break;
-                }
-            });
-            
-            // Build testing checklist functionality
-            function updateChecklist(checkbox) {
-                const label = checkbox.nextElementSibling;
-                if (checkbox.checked) {
-                    label.parentElement.classList.add('completed');
-                    // Auto-check next item after a short delay
-                    setTimeout(() => {
-                        const nextCheckbox = checkbox.parentElement.nextElementSibling?.querySelector('input[type="checkbox"]');
-                        if (nextCheckbox && !nextCheckbox.checked) {
-                            nextCheckbox.checked = true;
-                            updateChecklist(nextCheckbox);
-                        }
-                    }, 500);
-                } else {
-                    label.parentElement.classList.remove('completed');
-                }
-            }
-            
-            // Auto-check first item when page loads
-            window.addEventListener('load', function() {
-                const firstCheckbox = document.getElementById('check1');
-                if (firstCheckbox) {
-                    firstCheckbox.checked = true;
-                    updateChecklist(firstCheckbox);
-                }
-            });
-        </script>
-    </body>
-    </html>
+            ''')
+    head, rest = html.split('__TIMESTAMP__')
+    between, tail = rest.split('__CONTENT__')
+    return head, between, tail
+
+# Pre-rendered HTML parts for every story frame, keyed by frame id
+_STORY_FRAME_HTML = {
+    frame["id"]: _story_frame_html_parts(frame)
+    for frame in (*_STORY_FRAMES_LEAD, _STORY_FRAME_PERSONAL, _STORY_FRAME_RETURNING, *_STORY_FRAMES_TAIL)
+}
+
+@functools.lru_cache(maxsize=2)
+def _story_frame_timestamps(current_second):
+    """Formatted timestamp of every story frame, shared by all requests in the same second"""
+    return {
+        frame["id"]: time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(current_second + frame["offset"]))
+        for frame in (*_STORY_FRAMES_LEAD, _STORY_FRAME_PERSONAL, _STORY_FRAME_RETURNING, *_STORY_FRAMES_TAIL)
+    }
+
+def _story_frame_html(frame, timestamps, visitor_fields):
+    """HTML for one story frame at request time"""
+    head, between, tail = _STORY_FRAME_HTML[frame["id"]]
+    if "content_template" in frame:
+        content = frame["content_template"].format_map(visitor_fields)
+    else:
+        content = frame["content"]
+    return head + timestamps[frame["id"]] + between + content + tail
+
+# Digest of everything the /data page is built from at import: the page template and
+# every story frame's HTML and content. Part of the ETag, so a changed page is never revalidated.
+_DATA_PAGE_DIGEST = hashlib.blake2b('\0'.join(
+    [_DATA_TPL.template]
+    + [part for parts in _STORY_FRAME_HTML.values() for part in parts]
+    + [frame.get('content_template') or frame['content']
+       for frame in (*_STORY_FRAMES_LEAD, _STORY_FRAME_PERSONAL, _STORY_FRAME_RETURNING, *_STORY_FRAMES_TAIL)]
+).encode(), digest_size=16).hexdigest()
+
+# Frame timestamps are relative to now; a revalidated page may keep them this long (seconds)
+_DATA_ETAG_WINDOW = 60
+
+def _data_page_etag(visitor_fields, is_new_visitor, has_used_code):
+    """
+    Weak ETag for a /data page: the build, the page digest, the current timestamp window
+    and the visitor state the page was rendered with (after this request was tracked).
+    """
+    return hashlib.blake2b(repr((
+        BUILD_VERSION,
+        _DATA_PAGE_DIGEST,
+        int(time.time()) // _DATA_ETAG_WINDOW,
+        visitor_fields['visitor_id'],
+        visitor_fields['total_visits'],
+        is_new_visitor,
+        has_used_code,
+    )).encode(), digest_size=16).hexdigest()
+
+@app.route('/data', methods=['GET'])
+def data_stream():
+    """
+    Wiki Visualization Dashboard - Interactive exploration of Yourl.Cloud's purpose and architecture.
+    This endpoint provides a comprehensive visualization of the project's wiki content,
+    helping users understand the project's purpose through an interactive datastream interface.
     """
+    # Visitors with neither a visitor cookie nor a session all get the same anonymous page,
+    # which shared caches (CDN, reverse proxy) may serve; it does not start a session.
+    # Everyone else gets their personalized page, cacheable only by their own browser.
+    personalized = 'visitor_id' in request.cookies or app.config['SESSION_COOKIE_NAME'] in request.cookies
+    cache_control = 'private, must-revalidate' if personalized else 'public, max-age=60, stale-while-revalidate=300'
     
-    return make_response(html_content)
+    # Every request is tracked, revalidations included; a reload is still a visit
+    visitor_data = get_visitor_data() if personalized else {}
+    
+    # Visitor values end up in HTML (the visitor block and frame content), so escape them once here
+    visitor_fields = {
+        'visitor_id': str(escape(visitor_data.get('visitor_id', 'Unknown'))),
+        'total_visits': int(visitor_data.get('total_visits', 1))
+    }
+    is_new_visitor = visitor_data.get('is_new_visitor', True)
+    has_used_code = bool(visitor_data.get('has_used_code', False))
+    
+    # Revalidate against the visitor state after tracking: a counted visit changes the
+    # page, so only an unchanged page (anonymous, or untracked) gets a 304
+    etag = _data_page_etag(visitor_fields, is_new_visitor, has_used_code)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = cache_control
+        response.vary.update(('Cookie', 'Accept-Encoding'))
+        return response
+    
+    # Story frames are timestamped relative to now and filled with visitor data
+    timestamps = _story_frame_timestamps(int(time.time()))
+    
+    # Frames and page for this kind of visitor, both built at import
+    story_frame_sources, page_top_tpl, page_tail = _DATASTREAM_PAGES[(has_used_code, visitor_fields['total_visits'] > 1)]
+    
+    page_top = page_top_tpl.substitute(
+        visitor_id=visitor_fields['visitor_id'],
+        total_visits=visitor_fields['total_visits'],
+        visitor_status='Returning' if not is_new_visitor else 'New',
+        code_usage='Yes' if has_used_code else 'No')
+    
+    # Stream the page: everything up to the frames, each frame, then the static tail
+    def generate():
+        yield page_top
+        for frame in story_frame_sources:
+            yield _story_frame_html(frame, timestamps, visitor_fields)
+        yield page_tail
+    
+    response = _page_response(generate(), _DATA_PAGE_HEAD)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Cookie')
+    return response
+
+# Authenticated landing page, loaded once
+_AUTHENTICATED_TPL = _load_page_template('authenticated.html')
+_AUTHENTICATED_PAGE_HEAD = _precompress_page_head(_AUTHENTICATED_TPL)
+
+# /authenticated templates per (experience level, new visitor, used code), with those parts filled in
+_AUTHENTICATED_PAGES = {}
+
+def _authenticated_page_template(experience_level, is_new_visitor, has_used_code):
+    """Fill the visitor-independent parts of the /authenticated page once per combination"""
+    key = (experience_level, is_new_visitor, has_used_code)
+    tpl = _AUTHENTICATED_PAGES.get(key)
+    if tpl is None:
+        tpl = _AUTHENTICATED_PAGES[key] = Template(_AUTHENTICATED_TPL.safe_substitute(
+            experience_level=experience_level,
+            experience_level_title=_display_title(experience_level),
+            visitor_status='New Visitor' if is_new_visitor else 'Returning Visitor',
+            code_usage='Has used access codes' if has_used_code else 'First time using codes'))
+    return tpl
 
 @app.route('/authenticated')
 def authenticated_page():
@@ -1888,303 +1561,23 @@ def authenticated_page():
         return redirect('/', code=302)
     
     # Get authentication data from session
-    auth_data = session.get('auth_data', {})
-    if not auth_data:
+    experience_level = session.get('auth_experience_level')
+    if not experience_level:
         return redirect('/', code=302)
     
-    # Create the authenticated page HTML
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Yourl.Cloud Inc. - Authenticated Access</title>
-        <meta name="description" content="Welcome to Yourl.Cloud Inc. - Your trusted cloud infrastructure and API services partner.">
-        <meta name="robots" content="noindex, nofollow">
-        
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-            }}
-            .container {{ 
-                max-width: 1200px; 
-                margin: 0 auto; 
-                padding: 20px;
-                background: rgba(255, 255, 255, 0.95);
-                border-radius: 15px;
-                box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-                margin-top: 20px;
-                margin-bottom: 20px;
-            }}
-            .header {{ 
-                text-align: center; 
-                padding: 40px 0;
-                border-bottom: 3px solid #667eea;
-                margin-bottom: 30px;
-            }}
-            .logo {{ 
-                font-size: 3rem; 
-                font-weight: bold; 
-                color: #667eea;
-                margin-bottom: 10px;
-            }}
-            .tagline {{ 
-                font-size: 1.2rem; 
-                color: #666;
-                margin-bottom: 20px;
-            }}
-            .success-banner {{ 
-                background: linear-gradient(45deg, #28a745, #20c997);
-                color: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-                text-align: center;
-            }}
-            .visitor-info {{ 
-                background: #f8f9fa;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-                border-left: 5px solid #667eea;
-            }}
-            .experience-level {{
-                display: inline-block;
-                padding: 5px 15px;
-                border-radius: 20px;
-                font-size: 0.9rem;
-                font-weight: bold;
-                margin-bottom: 10px;
-            }}
-            .new-user {{ background: #28a745; color: white; }}
-            .returning-user {{ background: #ffc107; color: #333; }}
-            .returning-visitor {{ background: #17a2b8; color: white; }}
-            
-            .company-info {{ 
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-                gap: 30px;
-                margin-bottom: 30px;
-            }}
-            .info-card {{ 
-                background: white;
-                padding: 25px;
-                border-radius: 10px;
-                box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                border-top: 4px solid #667eea;
-            }}
-            .info-card h3 {{ 
-                color: #667eea;
-                margin-bottom: 15px;
-                font-size: 1.3rem;
-            }}
-            .services {{ 
-                background: #f8f9fa;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-            }}
-            .services h2 {{ 
-                color: #667eea;
-                margin-bottom: 20px;
-                text-align: center;
-            }}
-            .service-grid {{ 
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 20px;
-            }}
-            .service-item {{ 
-                background: white;
-                padding: 20px;
-                border-radius: 8px;
-                box-shadow: 0 3px 10px rgba(0,0,0,0.1);
-                text-align: center;
-            }}
-            .service-item h4 {{ 
-                color: #667eea;
-                margin-bottom: 10px;
-            }}
-            .navigation {{ 
-                text-align: center;
-                margin-top: 30px;
-                padding-top: 30px;
-                border-top: 2px solid #eee;
-            }}
-            .nav-btn {{ 
-                display: inline-block;
-                background: #667eea;
-                color: white;
-                padding: 12px 25px;
-                text-decoration: none;
-                border-radius: 25px;
-                margin: 10px;
-                transition: all 0.3s ease;
-                font-weight: bold;
-            }}
-            .nav-btn:hover {{ 
-                background: #5a6fd8;
-                transform: translateY(-2px);
-                box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-            }}
-            .footer {{ 
-                text-align: center;
-                padding: 30px 0;
-                color: #666;
-                border-top: 2px solid #eee;
-                margin-top: 30px;
-            }}
-            .privilege-badge {{
-                display: inline-block;
-                background: #ff6b6b;
-                color: white;
-                padding: 5px 12px;
-                border-radius: 15px;
-                font-size: 0.8rem;
-                margin: 5px;
-            }}
-            .affiliation-section {{
-                background: linear-gradient(45deg, #ff6b6b, #ee5a24);
-                color: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin: 20px 0;
-            }}
-            @media (max-width: 768px) {{
-                .container {{ margin: 10px; padding: 15px; }}
-                .logo {{ font-size: 2rem; }}
-                .company-info {{ grid-template-columns: 1fr; }}
-                .service-grid {{ grid-template-columns: 1fr; }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <!-- Header with Company Identity -->
-            <div class="header">
-                <div class="logo">Yourl.Cloud Inc.</div>
-                <div class="tagline">Secure Cloud Infrastructure & API Services</div>
-                <p>United States • Global Operations • Enterprise Solutions</p>
-            </div>
-
-            <!-- Success Banner for Authenticated Users -->
-            <div class="success-banner">
-                <h2>🎉 Welcome to Yourl.Cloud Inc.</h2>
-                <p><strong>Authentication Successful</strong> - You now have access to our enhanced services.</p>
-                <p>Experience Level: <span class="experience-level {auth_data.get('experience_level', 'new_user')}">{auth_data.get('experience_level', 'new_user').replace('_', ' ').title()}</span></p>
-            </div>
-
-            <!-- Visitor Information Section -->
-            <div class="visitor-info">
-                <h3>👤 Your Visitor Profile</h3>
-                <p><strong>Visitor ID:</strong> {auth_data.get('visitor_data', {}).get('visitor_id', 'Unknown')}</p>
-                <p><strong>Total Visits:</strong> {auth_data.get('visitor_data', {}).get('total_visits', 1)}</p>
-                <p><strong>Status:</strong> {'New Visitor' if auth_data.get('visitor_data', {}).get('is_new_visitor', True) else 'Returning Visitor'}</p>
-                <p><strong>Code Usage:</strong> {'Has used access codes' if auth_data.get('visitor_data', {}).get('has_used_code', False) else 'First time using codes'}</p>
-                {f'<p><strong>Tracking Key:</strong> {auth_data.get("visitor_data", {}).get("tracking_key")}</p>' if auth_data.get('visitor_data', {}).get('tracking_key') else ''}
-            </div>
-
-            <!-- Company Information for SEO -->
-            <div class="company-info">
-                <div class="info-card">
-                    <h3>🏢 About Yourl.Cloud Inc.</h3>
-                    <p>Yourl.Cloud Inc. is a leading technology company specializing in cloud infrastructure, API services, and digital solutions. Based in the United States, we serve clients globally with secure, scalable, and innovative technology solutions.</p>
-                    <p><strong>Founded:</strong> 2024</p>
-                    <p><strong>Headquarters:</strong> United States</p>
-                    <p><strong>Industry:</strong> Cloud Computing, API Services, Digital Infrastructure</p>
-                </div>
-                
-                <div class="info-card">
-                    <h3>🌐 Global Operations</h3>
-                    <p>Operating from the United States, Yourl.Cloud Inc. provides services to clients worldwide. Our infrastructure spans multiple regions, ensuring reliable, low-latency access to our services.</p>
-                    <p><strong>Primary Region:</strong> US-West1 (Google Cloud)</p>
-                    <p><strong>Service Availability:</strong> 24/7 Global Access</p>
-                    <p><strong>Compliance:</strong> US-based data centers</p>
-                </div>
-                
-                <div class="info-card">
-                    <h3>🔒 Security & Compliance</h3>
-                    <p>Yourl.Cloud Inc. maintains the highest standards of security and compliance. Our infrastructure is built on Google Cloud Platform, ensuring enterprise-grade security, reliability, and performance.</p>
-                    <p><strong>Infrastructure:</strong> Google Cloud Platform</p>
-                    <p><strong>Security:</strong> Enterprise-grade encryption</p>
-                    <p><strong>Compliance:</strong> Industry-standard protocols</p>
-                </div>
-            </div>
-
-            <!-- Services Section -->
-            <div class="services">
-                <h2>🚀 Our Services</h2>
-                <div class="service-grid">
-                    <div class="service-item">
-                        <h4>☁️ Cloud Infrastructure</h4>
-                        <p>Scalable, secure cloud solutions built on Google Cloud Platform with enterprise-grade reliability and performance.</p>
-                    </div>
-                    <div class="service-item">
-                        <h4>🔌 API Services</h4>
-                        <p>RESTful APIs and microservices architecture designed for modern applications and seamless integration.</p>
-                    </div>
-                    <div class="service-item">
-                        <h4>🛡️ Security Solutions</h4>
-                        <p>Advanced security protocols, encryption, and compliance measures to protect your data and applications.</p>
-                    </div>
-                    <div class="service-item">
-                        <h4>📱 Digital Solutions</h4>
-                        <p>Custom digital solutions tailored to your business needs, from web applications to mobile solutions.</p>
-                    </div>
-                </div>
-            </div>
-
-            <!-- Navigation Section -->
-            <div class="navigation">
-                <a href="/" class="nav-btn">🏠 Back to Landing Page</a>
-                <a href="/api" class="nav-btn">🔌 API Documentation</a>
-                <a href="/status" class="nav-btn">📊 Service Status</a>
-                <a href="/data" class="nav-btn">📡 Data Stream</a>
-            </div>
-
-            <!-- Footer -->
-            <div class="footer">
-                <p>&copy; 2024 Yourl.Cloud Inc. All rights reserved. | United States | Global Operations</p>
-                <p>Built with ❤️ for secure, scalable cloud solutions</p>
-            </div>
-        </div>
-        
-        <script>
-            // Add some interactive elements
-            document.querySelectorAll('.nav-btn').forEach(btn => {{
-                btn.addEventListener('click', function() {{
-                    this.style.transform = 'scale(0.95)';
-                    setTimeout(() => {{
-                        this.style.transform = 'scale(1)';
-                    }}, 150);
-                }});
-            }});
-            
-            // Add smooth scrolling for better UX
-            document.querySelectorAll('a[href^="#"]').forEach(anchor => {{
-                anchor.addEventListener('click', function (e) {{
-                    e.preventDefault();
-                    const target = document.querySelector(this.getAttribute('href'));
-                    if (target) {{
-                        target.scrollIntoView({{
-                            behavior: 'smooth',
-                            block: 'start'
-                        }});
-                    }}
-                }});
-            }});
-        </script>
-    </body>
-    </html>
-    """
+    visitor_id = session.get('auth_visitor_id', 'Unknown')
+    total_visits = session.get('auth_total_visits', 1)
+    is_new_visitor = bool(session.get('auth_is_new_visitor', True))
+    has_used_code = bool(session.get('auth_has_used_code', False))
+    tracking_key = session.get('auth_tracking_key')
     
-    return make_response(html_content)
+    page_tpl = _authenticated_page_template(experience_level, is_new_visitor, has_used_code)
+    html_content = page_tpl.substitute(
+        visitor_id=escape(visitor_id),
+        total_visits=int(total_visits),
+        tracking_key_html=f'<p><strong>Tracking Key:</strong> {escape(tracking_key)}</p>' if tracking_key else '')
+    
+    return _page_response((html_content,), _AUTHENTICATED_PAGE_HEAD)
 
 @app.errorhandler(404)
 def not_found(error):
@@ -2196,33 +1589,38 @@ def not_found(error):
         "error": "Not Found",
         "url": request.url,
         "message": "The requested resource was not found, but here's your request URL",
-        "timestamp": datetime.utcnow().isoformat(),
-        "friends_family_guard": FRIENDS_FAMILY_GUARD["enabled"],
+        "timestamp": g.get('now_iso') or utc_iso_now(),
+        "friends_family_guard": _GUARD_ENABLED,
         "cloud_run": {
-            "original_host": get_original_host(),
-            "original_protocol": get_original_protocol()
+            "original_host": g.get('orig_host') or get_original_host(),
+            "original_protocol": g.get('orig_proto') or get_original_protocol()
         }
-    }), 404
+    }), 404, {'Cache-Control': 'no-store'}
 
 @app.errorhandler(500)
 def internal_error(error):
     """
     Handle 500 errors.
     """
-    logger.error(f"Internal server error: {str(error)}")
+    logger.error("Internal server error: %s", error)
     return jsonify({
         "error": "Internal Server Error",
         "url": request.url,
         "message": "An internal server error occurred",
-        "timestamp": datetime.utcnow().isoformat(),
-        "friends_family_guard": FRIENDS_FAMILY_GUARD["enabled"]
-    }), 500
+        "timestamp": g.get('now_iso') or utc_iso_now(),
+        "friends_family_guard": _GUARD_ENABLED
+    }), 500, {'Cache-Control': 'no-store'}
 
 def launch_browser(url, delay=1.5):
     """
     Launch the default browser to the specified URL after a short delay.
     This allows the server to start up before the browser tries to connect.
     """
+    # Headless Linux has no browser to open, so don't start the thread at all
+    if platform.system() not in ('Darwin', 'Windows') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        return
+    print(f"🌐 Launching browser to: {url}")
+    
     def _launch():
         time.sleep(delay)  # Wait for server to start
         try:
@@ -2235,6 +1633,58 @@ def launch_browser(url, delay=1.5):
     browser_thread = threading.Thread(target=_launch, daemon=True)
     browser_thread.start()
 
+def _gunicorn_command():
+    """
+    Build the Gunicorn command line for start_production_server.
+    Threaded workers let blocking database calls overlap, and --preload imports
+    the app once before forking. Background threads (log listener, database
+    writer) are started per process, so they survive the fork.
+    """
+    cmd = [
+        "gunicorn",
+        "--bind", f"{HOST}:{PORT}",
+        "--workers", os.environ.get('WEB_CONCURRENCY', str(os.cpu_count() or 2)),
+        "--threads", os.environ.get('GUNICORN_THREADS', '8'),
+        "--worker-class", os.environ.get('GUNICORN_WORKER_CLASS', 'gthread'),
+        "--preload",
+    ]
+    if os.path.isdir('/dev/shm'):
+        # Keep the worker heartbeat file off a possibly slow disk
+        cmd += ["--worker-tmp-dir", "/dev/shm"]
+    cmd.append("app:app")
+    return cmd
+
+def _ensure_package(name):
+    """
+    pip-install a server package if it is missing.
+    find_spec looks the package up without importing it. Returns True if it had to be installed.
+    """
+    if importlib.util.find_spec(name) is not None:
+        return False
+    print(f"❌ {name.capitalize()} not found. Installing...")
+    subprocess.run([sys.executable, "-m", "pip", "install", name], check=True)
+    importlib.invalidate_caches()
+    return True
+
+def _serve_with_waitress(waitress):
+    """
+    Serve the app with Waitress in the main thread.
+    Waitress handles Ctrl+C itself, so no keep-alive loop is needed.
+    """
+    # Suppress Waitress logging messages
+    logging.getLogger('waitress').setLevel(logging.ERROR)
+    
+    # Show user-friendly localhost URL
+    display_host = 'localhost' if HOST == '0.0.0.0' else HOST
+    print(f"🌐 Server running at: http://{display_host}:{PORT}")
+    print("🚀 Yourl.Cloud is now accessible locally!")
+    print("=" * 60)
+    
+    try:
+        waitress.serve(app, host=HOST, port=PORT, threads=8, connection_limit=1000, channel_timeout=30)
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down server...")
+
 def start_production_server():
     """
     Start the application using a production WSGI server.
@@ -2244,88 +1694,46 @@ def start_production_server():
     
     if platform.system() == "Windows":
         # Use Waitress on Windows
-        try:
-            import waitress
-            print("✅ Using Waitress WSGI server (Windows)")
-            # Suppress Waitress logging messages
-            import logging
-            logging.getLogger('waitress').setLevel(logging.ERROR)
-            
-            # Start Waitress server in a separate thread to allow custom output
-            import threading
-            def run_waitress():
-                waitress.serve(app, host=HOST, port=PORT, threads=4, connection_limit=1000)
-            
-            server_thread = threading.Thread(target=run_waitress, daemon=True)
-            server_thread.start()
-            
-            # Show user-friendly localhost URL
-            display_host = 'localhost' if HOST == '0.0.0.0' else HOST
-            print(f"🌐 Server running at: http://{display_host}:{PORT}")
-            print("🚀 Yourl.Cloud is now accessible locally!")
-            print("=" * 60)
-            
-            # Keep main thread alive
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\n🛑 Shutting down server...")
-                return
-        except ImportError:
-            print("❌ Waitress not found. Installing...")
-            try:
-                subprocess.run([sys.executable, "-m", "pip", "install", "waitress"], check=True)
-                import waitress
-                print("✅ Waitress installed - starting production server...")
-                # Suppress Waitress logging messages
-                import logging
-                logging.getLogger('waitress').setLevel(logging.ERROR)
-                
-                # Start Waitress server in a separate thread to allow custom output
-                import threading
-                def run_waitress():
-                    waitress.serve(app, host=HOST, port=PORT, threads=4, connection_limit=1000)
-                
-                server_thread = threading.Thread(target=run_waitress, daemon=True)
-                server_thread.start()
-                
-                # Show user-friendly localhost URL
-                display_host = 'localhost' if HOST == '0.0.0.0' else HOST
-                print(f"🌐 Server running at: http://{display_host}:{PORT}")
-                print("🚀 Yourl.Cloud is now accessible locally!")
-                print("=" * 60)
-                
-                # Keep main thread alive
-                try:
-                    while True:
-                        time.sleep(1)
-                except KeyboardInterrupt:
-                    print("\n🛑 Shutting down server...")
-                    return
-            except Exception as e:
-                print(f"❌ Failed to install/use Waitress: {e}")
-                print("🔄 Falling back to Flask development server...")
-                app.run(host=HOST, port=PORT, debug=False, threaded=True)
+        server = "Waitress"
     else:
         # Use Gunicorn on Unix-like systems
-        try:
-            import gunicorn
-            print("✅ Using Gunicorn WSGI server (Unix)")
-            cmd = ["gunicorn", "--bind", f"{HOST}:{PORT}", "--workers", "4", "app:app"]
-            subprocess.run(cmd, check=True)
-        except ImportError:
-            print("❌ Gunicorn not found. Installing...")
-            try:
-                subprocess.run([sys.executable, "-m", "pip", "install", "gunicorn"], check=True)
-                import gunicorn
-                print("✅ Gunicorn installed - starting production server...")
-                cmd = ["gunicorn", "--bind", f"{HOST}:{PORT}", "--workers", "4", "app:app"]
-                subprocess.run(cmd, check=True)
-            except Exception as e:
-                print(f"❌ Failed to install/use Gunicorn: {e}")
-                print("🔄 Falling back to Flask development server...")
-                app.run(host=HOST, port=PORT, debug=False, threaded=True)
+        server = "Gunicorn"
+    
+    try:
+        if _ensure_package(server.lower()):
+            print(f"✅ {server} installed - starting production server...")
+    except Exception as e:
+        print(f"❌ Failed to install/use {server}: {e}")
+        print("🔄 Falling back to Flask development server...")
+        app.run(host=HOST, port=PORT, debug=False, threaded=True)
+        return
+    
+    if server == "Waitress":
+        import waitress
+        print("✅ Using Waitress WSGI server (Windows)")
+        _serve_with_waitress(waitress)
+    else:
+        print("✅ Using Gunicorn WSGI server (Unix)")
+        subprocess.run(_gunicorn_command(), check=True)
+
+def _current_code_recovery(reason: str, recovery_method: str) -> dict:
+    """
+    Recovery result that points the visitor at the current live code.
+    The code comes from the TTL cache behind get_current_marketing_password.
+    """
+    current_code = get_current_marketing_password()
+    return {
+        'success': True,
+        'message': f'{reason} - using current live code: {current_code}',
+        'suggested_code': current_code,
+        'recovery_method': recovery_method,
+        'usage_pattern': {
+            'total_attempts': 0,
+            'successful_attempts': 0,
+            'last_successful': None,
+            'last_attempt': None
+        }
+    }
 
 def attempt_code_recovery(visitor_id: str, user_agent: str, ip_address: str) -> dict:
     """
@@ -2333,57 +1741,33 @@ def attempt_code_recovery(visitor_id: str, user_agent: str, ip_address: str) ->
     This respects privacy by using only stored behavioral data.
     """
     try:
-        database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-        if not database_connection:
+        db_client = get_database_client()
+        if not db_client:
             # Fallback: suggest current live code when database is not available
-            current_code = get_current_marketing_password()
-            return {
-                'success': True,
-                'message': f'Database not connected - using current live code: {current_code}',
-                'suggested_code': current_code,
-                'recovery_method': 'current_code_fallback',
-                'usage_pattern': {
-                    'total_attempts': 0,
-                    'successful_attempts': 0,
-                    'last_successful': None,
-                    'last_attempt': None
-                }
-            }
-        
-        from scripts.database_client import DatabaseClient
-        db_client = DatabaseClient(database_connection)
+            return _current_code_recovery('Database not connected', 'current_code_fallback')
         
-        # Get visitor's access history
-        visitor_history = db_client.get_visitor_access_history(visitor_id)
+        # Get a summary of the visitor's access history
+        try:
+            summary = run_db_query(db_client.get_visitor_recovery_summary, visitor_id)
+        except concurrent.futures.TimeoutError:
+            logger.warning("Recovery summary for %s timed out after %ss", visitor_id, DATABASE_QUERY_TIMEOUT)
+            return _current_code_recovery('Recovery lookup timed out', 'current_code_timeout_fallback')
         
-        if not visitor_history:
+        if not summary:
             # No history found - suggest current code
-            current_code = get_current_marketing_password()
-            return {
-                'success': True,
-                'message': f'No previous usage history found - using current live code: {current_code}',
-                'suggested_code': current_code,
-                'recovery_method': 'current_code_no_history',
-                'usage_pattern': {
-                    'total_attempts': 0,
-                    'successful_attempts': 0,
-                    'last_successful': None,
-                    'last_attempt': None
-                }
-            }
+            return _current_code_recovery('No previous usage history found', 'current_code_no_history')
         
-        # Analyze patterns to suggest recovery
-        successful_codes = [h['access_code'] for h in visitor_history if h.get('success')]
-        recent_codes = [h['access_code'] for h in visitor_history[-5:]]  # Last 5 attempts
+        last_successful = summary['last_successful']
+        last_attempt = summary['last_attempt']
         
-        if successful_codes:
+        if last_successful:
             # User has successfully used codes before - suggest the most recent successful one
-            suggested_code = successful_codes[-1]
+            suggested_code = last_successful
             recovery_method = 'previous_success'
             message = f"Based on your previous successful usage, try: {suggested_code}"
-        elif recent_codes:
+        elif last_attempt:
             # User has attempted codes recently - suggest the most recent attempt
-            suggested_code = recent_codes[-1]
+            suggested_code = last_attempt
             recovery_method = 'recent_attempt'
             message = f"Based on your recent activity, you may have tried: {suggested_code}"
         else:
@@ -2398,23 +1782,17 @@ def attempt_code_recovery(visitor_id: str, user_agent: str, ip_address: str) ->
             'suggested_code': suggested_code,
             'recovery_method': recovery_method,
             'usage_pattern': {
-                'total_attempts': len(visitor_history),
-                'successful_attempts': len(successful_codes),
-                'last_successful': successful_codes[-1] if successful_codes else None,
-                'last_attempt': recent_codes[-1] if recent_codes else None
+                'total_attempts': summary['total_attempts'],
+                'successful_attempts': summary['successful_attempts'],
+                'last_successful': last_successful,
+                'last_attempt': last_attempt
             }
         }
         
     except Exception as e:
         print(f"⚠️ Error in code recovery: {e}")
         # Fallback: suggest current code on any error
-        current_code = get_current_marketing_password()
-        return {
-            'success': True,
-            'message': f'Recovery system error - using current live code: {current_code}',
-            'suggested_code': current_code,
-            'recovery_method': 'current_code_error_fallback'
-        }
+        return _current_code_recovery('Recovery system error', 'current_code_error_fallback')
 
 @app.route('/recover', methods=['GET', 'POST'])
 def code_recovery() -> Response:
@@ -2423,69 +1801,11 @@ def code_recovery() -> Response:
     Respects privacy by using only stored behavioral data.
     """
     if request.method == 'GET':
-        # Show recovery form
-        if os.path.exists('templates/recovery.html'):
-            return make_response(render_template('recovery.html'))
-        else:
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Code Recovery - Yourl.Cloud</title>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1">
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-                    .container {{ max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                    h1 {{ color: #333; text-align: center; }}
-                    .form-group {{ margin: 20px 0; }}
-                    label {{ display: block; margin-bottom: 5px; font-weight: bold; }}
-                    input[type="text"], input[type="password"] {{ width: 100%; padding: 10px; border: 1px solid #ddd; border-radius: 5px; font-size: 16px; }}
-                    button {{ background: #007bff; color: white; padding: 12px 30px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; }}
-                    button:hover {{ background: #0056b3; }}
-                    .info {{ background: #e7f3ff; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                    .recovery-message {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                    .privacy-note {{ background: #f8f9fa; padding: 10px; border-radius: 5px; margin: 20px 0; font-size: 14px; color: #666; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>🔐 Code Recovery</h1>
-                    <div class="info">
-                        <strong>Forgot your Yourl code?</strong><br>
-                        Don't worry! We can help you recover your experience based on your previous usage patterns.
-                    </div>
-                    
-                    <form method="POST">
-                        <div class="form-group">
-                            <label for="recovery_method">Recovery Method:</label>
-                            <select name="recovery_method" id="recovery_method" style="width: 100%; padding: 10px; border: 1px solid #ddd; border-radius: 5px; font-size: 16px;">
-                                <option value="auto">🤖 Automatic Recovery (Recommended)</option>
-                                <option value="manual">✍️ Manual Recovery</option>
-                            </select>
-                        </div>
-                        
-                        <div class="form-group">
-                            <label for="visitor_id">Visitor ID (if you remember it):</label>
-                            <input type="text" id="visitor_id" name="visitor_id" placeholder="Leave blank for automatic detection">
-                        </div>
-                        
-                        <button type="submit">🔍 Recover My Experience</button>
-                    </form>
-                    
-                    <div class="privacy-note">
-                        <strong>🔒 Privacy First:</strong> This recovery system uses only your stored behavioral data (codes you've used before, visit patterns) to help you regain access. We take safeguarding this data as seriously as PHI/PII.
-                    </div>
-                    
-                    <div class="info">
-                        <strong>Need Help?</strong><br>
-                        <a href="/">← Back to Home</a> | <a href="/data">📊 Data Stream</a>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            return make_response(html_content)
+        # Show recovery form: it has no dynamic parts, so it is a plain static
+        # file with ETag/Last-Modified validation and sendfile where available
+        response = send_from_directory(app.static_folder, 'recovery_form.html', max_age=300)
+        response.headers['Cache-Control'] = 'public, max-age=300, stale-while-revalidate=60'
+        return response
     
     elif request.method == 'POST':
         # Handle recovery request
@@ -2497,45 +1817,7 @@ def code_recovery() -> Response:
             visitor_id = request.cookies.get('visitor_id')
         
         if not visitor_id:
-            error_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Recovery Failed - Yourl.Cloud</title>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1">
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-                    .container {{ max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                    h1 {{ color: #333; text-align: center; }}
-                    .error {{ background: #f8d7da; border: 1px solid #f5c6cb; padding: 15px; border-radius: 5px; margin: 20px 0; color: #721c24; }}
-                    .info {{ background: #e7f3ff; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>🔐 Recovery Failed</h1>
-                    <div class="error">
-                        <strong>No visitor ID found.</strong><br>
-                        We couldn't identify your previous visits. This could happen if:
-                        <ul>
-                            <li>You're using a different browser or device</li>
-                            <li>Your browser cookies were cleared</li>
-                            <li>This is your first visit</li>
-                        </ul>
-                    </div>
-                    
-                    <div class="info">
-                        <strong>What you can do:</strong><br>
-                        • <a href="/">Try the current live code</a><br>
-                        • <a href="/recover">Try recovery again</a><br>
-                        • Contact support if you need assistance
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            return make_response(error_html)
+            return make_response(render_template('recovery_failed.html', message=None))
         
         # Attempt recovery
         recovery_result = attempt_code_recovery(
@@ -2545,114 +1827,21 @@ def code_recovery() -> Response:
         )
         
         if recovery_result['success']:
-            suggested_code = recovery_result['suggested_code']
-            recovery_method_used = recovery_result['recovery_method']
             usage_pattern = recovery_result.get('usage_pattern', {})
             
-            success_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Recovery Successful - Yourl.Cloud</title>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1">
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-                    .container {{ max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                    h1 {{ color: #333; text-align: center; }}
-                    .success {{ background: #d4edda; border: 1px solid #c3e6cb; padding: 15px; border-radius: 5px; margin: 20px 0; color: #155724; }}
-                    .code-display {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; margin: 20px 0; text-align: center; font-weight: bold; font-size: 18px; }}
-                    .info {{ background: #e7f3ff; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                    .usage-stats {{ background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                    button {{ background: #007bff; color: white; padding: 12px 30px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; margin: 5px; }}
-                    button:hover {{ background: #0056b3; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>🎉 Recovery Successful!</h1>
-                    <div class="success">
-                        <strong>We found your experience!</strong><br>
-                        {recovery_result['message']}
-                    </div>
-                    
-                    <div class="code-display">
-                        <strong>Suggested Code:</strong><br>
-                        <span style="font-size: 24px; color: #007bff;">{suggested_code}</span>
-                    </div>
-                    
-                    <div class="usage-stats">
-                        <strong>📊 Your Usage Pattern:</strong><br>
-                        • Total attempts: {usage_pattern.get('total_attempts', 0)}<br>
-                        • Successful attempts: {usage_pattern.get('successful_attempts', 0)}<br>
-                        • Last successful: {usage_pattern.get('last_successful', 'None')}<br>
-                        • Recovery method: {recovery_method_used.replace('_', ' ').title()}
-                    </div>
-                    
-                    <div style="text-align: center;">
-                        <button onclick="window.location.href='/'">🏠 Go to Home</button>
-                        <button onclick="copyToClipboard('{suggested_code}')">📋 Copy Code</button>
-                    </div>
-                    
-                    <div class="info">
-                        <strong>Next Steps:</strong><br>
-                        1. Copy the suggested code above<br>
-                        2. Go to the <a href="/">home page</a><br>
-                        3. Paste the code in the access field<br>
-                        4. Enjoy your recovered experience!
-                    </div>
-                </div>
-                
-                <script>
-                function copyToClipboard(text) {{
-                    navigator.clipboard.writeText(text).then(function() {{
-                        alert('Code copied to clipboard!');
-                    }}, function(err) {{
-                        console.error('Could not copy text: ', err);
-                    }});
-                }}
-                </script>
-            </body>
-            </html>
-            """
-            return make_response(success_html)
+            # Stream the page so the head goes out while the body is rendered
+            return Response(stream_template(
+                'recovery_success.html',
+                message=recovery_result['message'],
+                suggested_code=recovery_result['suggested_code'],
+                total_attempts=usage_pattern.get('total_attempts', 0),
+                successful_attempts=usage_pattern.get('successful_attempts', 0),
+                last_successful=usage_pattern.get('last_successful', 'None'),
+                recovery_method=recovery_result['recovery_method'].replace('_', ' ').title()
+            ))
         else:
             # Recovery failed
-            failed_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Recovery Failed - Yourl.Cloud</title>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1">
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-                    .container {{ max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                    h1 {{ color: #333; text-align: center; }}
-                    .error {{ background: #f8d7da; border: 1px solid #f5c6cb; padding: 15px; border-radius: 5px; margin: 20px 0; color: #721c24; }}
-                    .info {{ background: #e7f3ff; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>🔐 Recovery Failed</h1>
-                    <div class="error">
-                        <strong>Recovery unsuccessful.</strong><br>
-                        {recovery_result['message']}
-                    </div>
-                    
-                    <div class="info">
-                        <strong>What you can do:</strong><br>
-                        • <a href="/">Try the current live code</a><br>
-                        • <a href="/recover">Try recovery again</a><br>
-                        • Contact support if you need assistance<br>
-                        • Remember: It's OK to start over - the system will remember you based on how you use it!
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            return make_response(failed_html)
+            return make_response(render_template('recovery_failed.html', message=recovery_result['message']))
     
     # Default return for any other method
     return make_response("Method not allowed", 405)
@@ -3462,10 +2651,8 @@ def generate_token():
         }), 401
     
     # Check if code is valid (current or next marketing password)
-    current_password = get_current_marketing_password()
-    next_password = get_next_marketing_password()
-    
-    if auth_code not in [current_password, next_password]:
+    if not (marketing_code_matches(auth_code, get_current_marketing_password())
+            or marketing_code_matches(auth_code, get_next_marketing_password())):
         return jsonify({
             'success': False,
             'error': 'Invalid authentication code',
@@ -3503,9 +2690,9 @@ def render_monitoring_stats_html(stats, authenticated_user, auth_method):
     
     # Get server info for the template
     server_info = {
-        'host': get_original_host(),
-        'protocol': get_original_protocol(),
-        'base_url': f"{get_original_protocol()}://{get_original_host()}"
+        'host': g.orig_host,
+        'protocol': g.orig_proto,
+        'base_url': g.base_url
     }
     
     html_content = f"""
@@ -3698,25 +2885,22 @@ def render_monitoring_stats_html(stats, authenticated_user, auth_method):
 # Cache and Trust Management Functions
 def clear_cached_codes_and_tokens():
     """Clear all cached marketing codes, tokens, and session data"""
-    global _current_code_printed, _next_code_printed
-    
     results = {
         'cleared_items': [],
         'errors': []
     }
     
     try:
-        # Reset global cache flags
-        _current_code_printed = False
-        _next_code_printed = False
-        results['cleared_items'].append('Global code cache flags')
+        generate_marketing_password.cache_clear()
+        generate_marketing_password_from_hash.cache_clear()
+        results['cleared_items'].append('Generated code cache')
         
         # Clear session data for all active sessions (if we had session management)
         # Note: Flask sessions are per-request, so we clear current session
         if session:
             session_keys = list(session.keys())
             for key in session_keys:
-                if key in ['authenticated', 'last_access_code', 'redirect_after_auth', 'auth_data']:
+                if key in ['authenticated', 'last_access_code', 'redirect_after_auth'] or key.startswith('auth_'):
                     session.pop(key, None)
                     results['cleared_items'].append(f'Session: {key}')
         
@@ -3757,12 +2941,9 @@ def rebuild_codes_from_shared_context(trust_verification=None):
                 return results
         
         # Try to rebuild from database first
-        database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-        if database_connection:
+        db_client = get_database_client()
+        if db_client:
             try:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection)
-                
                 # Get fresh codes from database
                 current_from_db = db_client.get_current_marketing_code()
                 next_from_db = db_client.get_next_marketing_code()
@@ -3777,8 +2958,7 @@ def rebuild_codes_from_shared_context(trust_verification=None):
         
         # Try to rebuild from Secret Manager
         try:
-            from scripts.secret_manager_client import SecretManagerClient
-            client = SecretManagerClient(os.environ.get('GOOGLE_CLOUD_PROJECT', 'yourl-cloud'))
+            client = get_secret_manager_client()
             
             current_from_sm = client.get_current_marketing_code()
             next_from_sm = client.get_next_marketing_code()
@@ -3795,12 +2975,19 @@ def rebuild_codes_from_shared_context(trust_verification=None):
         if not results['rebuilt_items']:
             try:
                 fresh_current = generate_marketing_password()
-                fresh_next = generate_marketing_password_from_hash(get_git_info()['commit_hash'])
+                fresh_next = generate_marketing_password_from_hash(_COMMIT_HASH or 'unknown')
                 results['rebuilt_items'].append(f'Generated fresh current code: {fresh_current}')
                 results['rebuilt_items'].append(f'Generated fresh next code: {fresh_next}')
             except Exception as e:
                 results['errors'].append(f'Fresh code generation failed: {str(e)}')
         
+        # Refresh the live codes served by this instance
+        try:
+            live_current, live_next = reload_marketing_passwords()
+            results['rebuilt_items'].append(f'Reloaded live codes: {live_current} / {live_next}')
+        except Exception as e:
+            results['errors'].append(f'Live code reload failed: {str(e)}')
+        
         if results['rebuilt_items']:
             results['success'] = True
             results['message'] = f"Successfully rebuilt {len(results['rebuilt_items'])} items"
@@ -3819,18 +3006,18 @@ def get_cache_status():
     """Get current cache status and statistics"""
     status = {
         'cache_flags': {
-            'current_code_printed': _current_code_printed,
-            'next_code_printed': _next_code_printed
+            'current_code_cached': _current_marketing_password is not None,
+            'next_code_cached': _next_marketing_password is not None
         },
         'session_data': {
             'authenticated': session.get('authenticated', False),
             'has_access_code': bool(session.get('last_access_code')),
-            'has_auth_data': bool(session.get('auth_data')),
+            'has_auth_data': bool(session.get('auth_experience_level')),
             'session_keys': list(session.keys()) if session else []
         },
         'environment_cache': {},
         'available_sources': {
-            'database': bool(os.environ.get('DATABASE_CONNECTION_STRING')),
+            'database': bool(DATABASE_CONNECTION_STRING),
             'secret_manager': bool(os.environ.get('GOOGLE_CLOUD_PROJECT')),
             'fallback_generation': True
         }
@@ -3846,9 +3033,9 @@ def get_cache_status():
 def render_cache_management_html(cache_status, authenticated_user, auth_method):
     """Render cache management interface as HTML"""
     server_info = {
-        'host': get_original_host(),
-        'protocol': get_original_protocol(),
-        'base_url': f"{get_original_protocol()}://{get_original_host()}"
+        'host': g.orig_host,
+        'protocol': g.orig_proto,
+        'base_url': g.base_url
     }
     
     html_content = f"""
@@ -4010,11 +3197,11 @@ def render_cache_management_html(cache_status, authenticated_user, auth_method):
                 <h3>📊 Current Cache Status</h3>
                 <div class="status-item">
                     <span>Current Code Cached:</span>
-                    <span class="status-value status-{str(cache_status['cache_flags']['current_code_printed']).lower()}">{cache_status['cache_flags']['current_code_printed']}</span>
+                    <span class="status-value status-{str(cache_status['cache_flags']['current_code_cached']).lower()}">{cache_status['cache_flags']['current_code_cached']}</span>
                 </div>
                 <div class="status-item">
                     <span>Next Code Cached:</span>
-                    <span class="status-value status-{str(cache_status['cache_flags']['next_code_printed']).lower()}">{cache_status['cache_flags']['next_code_printed']}</span>
+                    <span class="status-value status-{str(cache_status['cache_flags']['next_code_cached']).lower()}">{cache_status['cache_flags']['next_code_cached']}</span>
                 </div>
                 <div class="status-item">
                     <span>Session Authenticated:</span>
@@ -4180,7 +3367,7 @@ def cache_management():
         if not token:
             if request.headers.get('Accept', '').find('text/html') != -1:
                 session['redirect_after_auth'] = request.url
-                return redirect(f"{get_original_protocol()}://{get_original_host()}/")
+                return redirect(f"{g.base_url}/")
             else:
                 return jsonify({
                     'success': False,
@@ -4192,7 +3379,7 @@ def cache_management():
         if not token_data.get('valid'):
             if request.headers.get('Accept', '').find('text/html') != -1:
                 session['redirect_after_auth'] = request.url
-                return redirect(f"{get_original_protocol()}://{get_original_host()}/")
+                return redirect(f"{g.base_url}/")
             else:
                 return jsonify({
                     'success': False,
@@ -4250,10 +3437,8 @@ def cache_management():
         
         # Log the cache operation
         try:
-            database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-            if database_connection:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection)
+            db_client = get_database_client()
+            if db_client:
                 db_client.log_usage(
                     code=f"cache_{action}",
                     user_agent=request.headers.get('User-Agent'),
@@ -4278,16 +3463,16 @@ def monitoring_stats():
     auth_method = None
     
     # Check for session authentication first (from landing page login)
-    if session.get('authenticated', False) and session.get('last_access_code'):
+    session_code = session.get('last_access_code')
+    if session_code and session.get('authenticated', False):
         # Verify the session is still valid with current or previous marketing codes
         current_code = get_current_marketing_password()
         next_code = get_next_marketing_password()
-        session_code = session.get('last_access_code')
         
-        if session_code not in [current_code, next_code]:
+        if session_code not in (current_code, next_code):
             # Session code is outdated, clear session and require new auth
-            session.pop('authenticated', None)
-            session.pop('last_access_code', None)
+            del session['authenticated']
+            del session['last_access_code']
             authenticated_user = None
         else:
             # User is authenticated via landing page login - get visitor ID safely
@@ -4314,7 +3499,7 @@ def monitoring_stats():
                 # Store the requested URL for redirect after authentication
                 session['redirect_after_auth'] = request.url
                 # Redirect to landing page for authentication
-                return redirect(f"{get_original_protocol()}://{get_original_host()}/")
+                return redirect(f"{g.base_url}/")
             else:
                 # API request - return JSON error
                 return jsonify({
@@ -4322,8 +3507,8 @@ def monitoring_stats():
                     'error': 'Authentication required',
                     'message': 'Please log in with a marketing code on the landing page, or provide a valid monitoring token',
                     'auth_options': {
-                        'session_login': f"{get_original_protocol()}://{get_original_host()}/",
-                        'token_generation': f"{get_original_protocol()}://{get_original_host()}/monitoring/token"
+                        'session_login': f"{g.base_url}/",
+                        'token_generation': f"{g.base_url}/monitoring/token"
                     }
                 }), 401
         
@@ -4334,7 +3519,7 @@ def monitoring_stats():
             if request.headers.get('Accept', '').find('text/html') != -1:
                 # Store the requested URL and redirect to landing page
                 session['redirect_after_auth'] = request.url
-                return redirect(f"{get_original_protocol()}://{get_original_host()}/")
+                return redirect(f"{g.base_url}/")
             else:
                 # API request - return JSON error
                 return jsonify({
@@ -4353,8 +3538,8 @@ def monitoring_stats():
             'authenticated_user': authenticated_user,
             'auth_method': auth_method,
             'server_info': {
-                'host': get_original_host(),
-                'protocol': get_original_protocol(),
+                'host': g.orig_host,
+                'protocol': g.orig_proto,
                 'debug_mode': DEBUG,
                 'production_mode': PRODUCTION,
                 'session_id': session.get('session_id', 'unknown')
@@ -4367,12 +3552,9 @@ def monitoring_stats():
         }
         
         # Get database connection for detailed stats with timeout protection
-        database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-        if database_connection:
+        db_client = get_database_client()
+        if db_client:
             try:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection)
-                
                 # Visitor statistics with error handling
                 try:
                     stats['visitor_stats'] = {
@@ -4491,7 +3673,7 @@ def monitoring_stats():
                 <h1>🚨 Monitoring Statistics Error</h1>
                 <p><strong>Error:</strong> Statistics collection failed</p>
                 <p><strong>Details:</strong> {str(e)}</p>
-                <p><a href="{get_original_protocol()}://{get_original_host()}/">← Back to Home</a></p>
+                <p><a href="{g.base_url}/">← Back to Home</a></p>
             </body>
             </html>
             """, 500
@@ -4511,9 +3693,9 @@ def monitoring_dashboard():
     """
     # Get current server info
     server_info = {
-        'host': get_original_host(),
-        'protocol': get_original_protocol(),
-        'base_url': f"{get_original_protocol()}://{get_original_host()}"
+        'host': g.orig_host,
+        'protocol': g.orig_proto,
+        'base_url': g.base_url
     }
     
     # Get current marketing codes for reference
@@ -4890,27 +4072,28 @@ def monitoring_health():
     try:
         # Basic health checks
         health_status = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': utc_iso_now(),
             'status': 'healthy',
-            'uptime': time.time() - app.start_time if hasattr(app, 'start_time') else 'unknown',
+            'uptime': time.monotonic() - APP_START_TIME,
             'version': 'yourl-cloud-2024',
             'environment': 'production' if PRODUCTION else 'development'
         }
         
         # Database health check
-        database_connection = os.environ.get('DATABASE_CONNECTION_STRING')
-        if database_connection:
+        if DATABASE_CONNECTION_STRING and DatabaseClient is None:
+            health_status['database'] = 'error: database client not installed'
+            health_status['status'] = 'degraded'
+        elif DATABASE_CONNECTION_STRING:
             try:
-                from scripts.database_client import DatabaseClient
-                db_client = DatabaseClient(database_connection)
-                # Simple ping test
-                conn = db_client._get_connection()
-                if conn:
-                    conn.close()
+                # SELECT 1 on a pooled connection, bounded by DATABASE_QUERY_TIMEOUT
+                if run_db_query(get_database_client().ping):
                     health_status['database'] = 'connected'
                 else:
                     health_status['database'] = 'disconnected'
                     health_status['status'] = 'degraded'
+            except concurrent.futures.TimeoutError:
+                health_status['database'] = 'error: ping timed out'
+                health_status['status'] = 'degraded'
             except Exception as e:
                 health_status['database'] = f'error: {str(e)}'
                 health_status['status'] = 'degraded'
@@ -4923,14 +4106,15 @@ def monitoring_health():
         
     except Exception as e:
         return jsonify({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': utc_iso_now(),
             'status': 'unhealthy',
             'error': str(e)
         }), 500
 
 if __name__ == '__main__':
-    # Track app start time for uptime monitoring
-    app.start_time = time.time()
+    # Local development - use random available port
+    if PORT is None:
+        PORT = find_free_port()
     
     # Determine the display address for users
     if HOST == '0.0.0.0':
@@ -4941,23 +4125,27 @@ if __name__ == '__main__':
     # Get current marketing password
     current_password = get_current_marketing_password()
     
-    print(f"🚀 Starting URL API Server with Visual Inspection")
-    print(f"📍 Host: {display_host}")
-    print(f"🐛 Debug: {DEBUG}")
-    print(f"🏭 Production: {PRODUCTION} (All instances are production instances)")
-    print(f"🆔 Session: {FRIENDS_FAMILY_GUARD['session_id']}")
-    print(f"🏢 Organization: {FRIENDS_FAMILY_GUARD['organization']}")
-    print(f"🛡️ Friends and Family Guard: {'Enabled' if FRIENDS_FAMILY_GUARD['enabled'] else 'Disabled'}")
-    print(f"👁️ Visual Inspection: PC/Phone/Tablet allowed, Watch blocked")
-    print(f"☁️ Google Cloud Run Support: Enabled")
-    print(f"🌐 Domain Mapping: {'Enabled' if CLOUD_RUN_CONFIG['domain_mapping_enabled'] else 'Disabled'}")
-    print(f"🎪 Marketing Password: {current_password}")
-    print("=" * 60)
+    # Write the banner in one go rather than one flush per line
+    banner = "\n".join([
+        "🚀 Starting URL API Server with Visual Inspection",
+        f"📍 Host: {display_host}",
+        f"🐛 Debug: {DEBUG}",
+        f"🏭 Production: {PRODUCTION} (All instances are production instances)",
+        f"🆔 Session: {FRIENDS_FAMILY_GUARD['session_id']}",
+        f"🏢 Organization: {FRIENDS_FAMILY_GUARD['organization']}",
+        f"🛡️ Friends and Family Guard: {'Enabled' if FRIENDS_FAMILY_GUARD['enabled'] else 'Disabled'}",
+        "👁️ Visual Inspection: PC/Phone/Tablet allowed, Watch blocked",
+        "☁️ Google Cloud Run Support: Enabled",
+        f"🌐 Domain Mapping: {'Enabled' if CLOUD_RUN_CONFIG['domain_mapping_enabled'] else 'Disabled'}",
+        f"🎪 Marketing Password: {current_password}",
+        "=" * 60,
+    ])
+    sys.stdout.write(banner + "\n")
+    sys.stdout.flush()
     
     # Launch browser for local development (not for production/Cloud Run)
-    if not os.environ.get('PORT'):
+    if not any(os.environ.get(k) for k in ('PORT', 'K_SERVICE', 'GAE_ENV', 'KUBERNETES_SERVICE_HOST')):
         local_url = f"http://{display_host}:{PORT}"
-        print(f"🌐 Launching browser to: {local_url}")
         launch_browser(local_url)
     
     # Start with production WSGI server
@@ -9,9 +9,17 @@ dashboard for Yourl.Cloud's purpose and architecture.
 Author: Yourl.Cloud Inc.
 """
 
-from flask import Flask, request, jsonify, make_response
-from datetime import datetime, timedelta
+from flask import Flask, request, make_response, Response
+from datetime import datetime, timedelta, timezone
 import os
+import json
+import time
+import random
+import functools
+import hmac
+import tempfile
+from jinja2 import Environment, DictLoader, FileSystemBytecodeCache
+from markupsafe import escape
 
 app = Flask(__name__)
 
@@ -19,36 +27,34 @@ app = Flask(__name__)
 HOST = '0.0.0.0'
 PORT = int(os.environ.get('PORT', 8080))
 
-@app.route('/')
-def home():
-    """Landing page with marketing code input and current build code display"""
-    
-    # Generate a simple token code for demonstration
-    import hashlib
-    import time
-    import random
-    
-    # Simple, friendly words for token codes
-    friendly_words = [
-        "CLOUD", "DREAM", "BUILD", "CREATE", "LAUNCH", "SPARK", "SHINE", "RISE", 
-        "POWER", "MAGIC", "WONDER", "ROCKET", "STAR", "OCEAN", "MOUNTAIN", "FOREST",
-        "FRIEND", "FAMILY", "TEAM", "SQUAD", "CREW", "TRIBE", "CLAN", "SQUAD"
-    ]
-    
-    # Special characters
-    special_chars = ["!", "@", "#", "$", "%", "&", "*", "+", "=", "?", "~", "^"]
-    
-    # Generate deterministic but friendly token code
-    current_time = int(time.time() // 3600)  # Change every hour
-    random.seed(current_time)  # Use time as seed for consistency
-    
-    word = random.choice(friendly_words)
-    number = random.randint(10, 99)  # Two digit number
-    special = random.choice(special_chars)
-    
-    token_code = f"{word}{number}{special}"
-    
-    html_content = f"""
+# Simple, friendly words for token codes
+_FRIENDLY_WORDS = (
+    "CLOUD", "DREAM", "BUILD", "CREATE", "LAUNCH", "SPARK", "SHINE", "RISE", 
+    "POWER", "MAGIC", "WONDER", "ROCKET", "STAR", "OCEAN", "MOUNTAIN", "FOREST",
+    "FRIEND", "FAMILY", "TEAM", "SQUAD", "CREW", "TRIBE", "CLAN", "SQUAD"
+)
+
+# Special characters
+_SPECIAL_CHARS = ("!", "@", "#", "$", "%", "&", "*", "+", "=", "?", "~", "^")
+
+@functools.lru_cache(maxsize=2)
+def _token_code_for_hour(hour):
+    """
+    Deterministic but friendly token code for the given hour.
+    Uses its own Random instance so the process-wide generator is never reseeded.
+    """
+    rng = random.Random(hour)
+    word = rng.choice(_FRIENDLY_WORDS)
+    number = rng.randint(10, 99)  # Two digit number
+    special = rng.choice(_SPECIAL_CHARS)
+    return f"{word}{number}{special}"
+
+def current_token_code():
+    """Token code shown on the landing page (changes every hour)"""
+    return _token_code_for_hour(int(time.time() // 3600))
+
+# Landing page markup is fixed apart from the token code, so build it once
+_LANDING_HEAD = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -56,7 +62,7 @@ def home():
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Yourl.Cloud - AI-Friendly Service Hub</title>
         <style>
-            :root {{
+            :root {
                 --primary-color: #667eea;
                 --secondary-color: #764ba2;
                 --accent-color: #ffd700;
@@ -68,35 +74,35 @@ def home():
                 --border-radius: 20px;
                 --shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
                 --transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            }}
+            }
             
-            * {{
+            * {
                 margin: 0;
                 padding: 0;
                 box-sizing: border-box;
-            }}
+            }
             
-            body {{ 
+            body { 
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
                 background: var(--bg-primary);
                 color: var(--text-primary);
                 min-height: 100vh;
                 line-height: 1.6;
-            }}
+            }
             
-            .container {{
+            .container {
                 max-width: 800px;
                 margin: 0 auto;
                 padding: 2rem;
-            }}
+            }
             
-            .header {{
+            .header {
                 text-align: center;
                 margin-bottom: 3rem;
                 animation: fadeInUp 0.8s ease-out;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 font-size: clamp(2rem, 5vw, 3.5rem);
                 margin-bottom: 0.5rem;
                 text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
@@ -104,16 +110,16 @@ def home():
                 -webkit-background-clip: text;
                 -webkit-text-fill-color: transparent;
                 background-clip: text;
-            }}
+            }
             
-            .header p {{
+            .header p {
                 font-size: clamp(1rem, 2.5vw, 1.3rem);
                 opacity: 0.9;
                 max-width: 600px;
                 margin: 0 auto;
-            }}
+            }
             
-            .main-panel {{
+            .main-panel {
                 background: var(--bg-secondary);
                 border-radius: var(--border-radius);
                 backdrop-filter: blur(10px);
@@ -122,27 +128,27 @@ def home():
                 margin-bottom: 2rem;
                 animation: fadeInUp 0.8s ease-out 0.2s both;
                 border: 1px solid rgba(255, 255, 255, 0.2);
-            }}
+            }
             
-            .input-section {{
+            .input-section {
                 margin-bottom: 2rem;
-            }}
+            }
             
-            .input-section h2 {{
+            .input-section h2 {
                 margin-bottom: 1rem;
                 color: var(--primary-color);
                 font-size: 1.5rem;
                 text-align: center;
-            }}
+            }
             
-            .input-group {{
+            .input-group {
                 display: flex;
                 gap: 1rem;
                 margin-bottom: 1rem;
                 flex-wrap: wrap;
-            }}
+            }
             
-            .input-group input {{
+            .input-group input {
                 flex: 1;
                 min-width: 250px;
                 padding: 1rem;
@@ -155,31 +161,31 @@ def home():
                 font-family: 'Courier New', monospace;
                 letter-spacing: 1px;
                 text-align: center;
-            }}
+            }
             
-            .input-group input:focus {{
+            .input-group input:focus {
                 outline: none;
                 border-color: var(--accent-color);
                 box-shadow: 0 0 0 3px rgba(255, 215, 0, 0.3);
-            }}
+            }
             
-            .input-group input:not(:placeholder-shown) {{
+            .input-group input:not(:placeholder-shown) {
                 border-color: var(--primary-color);
                 background: rgba(255, 255, 255, 0.98);
-            }}
+            }
             
-            .input-hint {{
+            .input-hint {
                 text-align: center;
                 margin-top: 0.5rem;
                 opacity: 0.8;
-            }}
+            }
             
-            .input-hint small {{
+            .input-hint small {
                 font-size: 0.9rem;
                 color: var(--text-secondary);
-            }}
+            }
             
-            .submit-btn {{
+            .submit-btn {
                 background: var(--primary-color);
                 border: none;
                 color: white;
@@ -189,15 +195,15 @@ def home():
                 font-size: 1.1rem;
                 transition: var(--transition);
                 white-space: nowrap;
-            }}
+            }
             
-            .submit-btn:hover {{
+            .submit-btn:hover {
                 background: var(--secondary-color);
                 transform: translateY(-2px);
                 box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
-            }}
+            }
             
-            .token-code-display {{
+            .token-code-display {
                 background: linear-gradient(135deg, rgba(255, 255, 255, 0.95) 0%, rgba(236, 240, 241, 0.9) 100%);
                 border-radius: 15px;
                 padding: 1.5rem;
@@ -206,16 +212,16 @@ def home():
                 border: 2px solid #3498db;
                 box-shadow: 0 8px 25px rgba(52, 152, 219, 0.15);
                 backdrop-filter: blur(10px);
-            }}
+            }
             
-            .token-code-display h2 {{
+            .token-code-display h2 {
                 color: #2c3e50;
                 margin-bottom: 1rem;
                 font-size: 1.3rem;
                 font-weight: 600;
-            }}
+            }
             
-            .code-display {{
+            .code-display {
                 font-family: 'Courier New', monospace;
                 font-size: clamp(1.2rem, 3vw, 1.8rem);
                 font-weight: bold;
@@ -232,21 +238,21 @@ def home():
                 box-shadow: 0 4px 15px rgba(52, 152, 219, 0.3);
                 position: relative;
                 overflow: hidden;
-            }}
+            }
             
-            .code-display:hover {{
+            .code-display:hover {
                 background: linear-gradient(135deg, #d5dbdb 0%, #a4a4a4 100%);
                 border-color: #2980b9;
                 transform: translateY(-2px);
                 box-shadow: 0 6px 20px rgba(52, 152, 219, 0.4);
-            }}
+            }
             
-            .code-display:active {{
+            .code-display:active {
                 transform: translateY(0);
                 box-shadow: 0 2px 10px rgba(52, 152, 219, 0.3);
-            }}
+            }
             
-            .copy-feedback {{
+            .copy-feedback {
                 display: none;
                 color: #27ae60;
                 font-weight: bold;
@@ -256,9 +262,9 @@ def home():
                 padding: 0.5rem 1rem;
                 border-radius: 8px;
                 border: 1px solid rgba(39, 174, 96, 0.3);
-            }}
+            }
             
-            .code-hint {{
+            .code-hint {
                 font-style: italic;
                 opacity: 0.9;
                 font-size: 0.9rem;
@@ -268,47 +274,47 @@ def home():
                 padding: 0.5rem;
                 border-radius: 6px;
                 border-left: 3px solid #3498db;
-            }}
+            }
             
-            .previous-codes {{
+            .previous-codes {
                 background: var(--bg-tertiary);
                 border-radius: 15px;
                 padding: 1.5rem;
                 margin-bottom: 2rem;
                 border: 1px solid rgba(255, 255, 255, 0.2);
                 animation: fadeInUp 0.8s ease-out 0.3s both;
-            }}
+            }
             
-            .previous-codes h2 {{
+            .previous-codes h2 {
                 color: var(--primary-color);
                 margin-bottom: 0.5rem;
                 font-size: 1.3rem;
                 text-align: center;
-            }}
+            }
             
-            .no-codes {{
+            .no-codes {
                 text-align: center;
                 padding: 2rem 1rem;
                 opacity: 0.8;
-            }}
+            }
             
-            .no-codes p {{
+            .no-codes p {
                 margin-bottom: 0.5rem;
                 font-size: 1rem;
-            }}
+            }
             
-            .no-codes-hint {{
+            .no-codes-hint {
                 font-size: 0.9rem;
                 opacity: 0.7;
                 font-style: italic;
-            }}
+            }
             
-            .nav-links {{
+            .nav-links {
                 margin-top: 2rem;
                 text-align: center;
-            }}
+            }
             
-            .nav-links a {{
+            .nav-links a {
                 display: inline-block;
                 margin: 10px;
                 padding: 10px 20px;
@@ -318,45 +324,45 @@ def home():
                 border-radius: 8px;
                 transition: var(--transition);
                 border: 1px solid rgba(255, 255, 255, 0.2);
-            }}
+            }
             
-            .nav-links a:hover {{
+            .nav-links a:hover {
                 background: rgba(255, 255, 255, 0.3);
                 transform: translateY(-2px);
                 box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
-            }}
+            }
             
-            @keyframes fadeInUp {{
-                from {{
+            @keyframes fadeInUp {
+                from {
                     opacity: 0;
                     transform: translateY(30px);
-                }}
-                to {{
+                }
+                to {
                     opacity: 1;
                     transform: translateY(0);
-                }}
-            }}
+                }
+            }
             
 
             
-            @keyframes fadeIn {{
-                from {{ opacity: 0; }}
-                to {{ opacity: 1; }}
-            }}
+            @keyframes fadeIn {
+                from { opacity: 0; }
+                to { opacity: 1; }
+            }
             
-            @media (max-width: 768px) {{
-                .container {{
+            @media (max-width: 768px) {
+                .container {
                     padding: 1rem;
-                }}
+                }
                 
-                .input-group {{
+                .input-group {
                     flex-direction: column;
-                }}
+                }
                 
-                .input-group input {{
+                .input-group input {
                     min-width: auto;
-                }}
-            }}
+                }
+            }
         </style>
     </head>
     <body>
@@ -395,7 +401,9 @@ def home():
                 <div class="token-code-display">
                     <h2>🎯 Current Token Code</h2>
                     <div class="code-display" id="codeText" onclick="copyTokenCode()" role="button" tabindex="0" aria-label="Click to copy current token code">
-                        {token_code}
+                        """
+
+_LANDING_TAIL = """
                     </div>
                     <div class="copy-feedback" id="copyFeedback">✅ Token code copied to clipboard!</div>
                     <div class="code-hint">💡 Click the token code above to copy it to your clipboard</div>
@@ -420,25 +428,25 @@ def home():
 
         <script>
             // Copy token code functionality
-            function copyTokenCode() {{
+            function copyTokenCode() {
                 const codeText = document.getElementById('codeText');
                 const copyFeedback = document.getElementById('copyFeedback');
                 
-                if (navigator.clipboard && window.isSecureContext) {{
+                if (navigator.clipboard && window.isSecureContext) {
                     // Use modern clipboard API
-                    navigator.clipboard.writeText(codeText.textContent.trim()).then(() => {{
+                    navigator.clipboard.writeText(codeText.textContent.trim()).then(() => {
                         showCopyFeedback();
-                    }}).catch(err => {{
+                    }).catch(err => {
                         console.error('Failed to copy: ', err);
                         fallbackCopy();
-                    }});
-                }} else {{
+                    });
+                } else {
                     // Fallback for older browsers
                     fallbackCopy();
-                }}
-            }}
+                }
+            }
             
-            function fallbackCopy() {{
+            function fallbackCopy() {
                 const codeText = document.getElementById('codeText');
                 const textArea = document.createElement('textarea');
                 textArea.value = codeText.textContent.trim();
@@ -449,96 +457,80 @@ def home():
                 textArea.focus();
                 textArea.select();
                 
-                try {{
+                try {
                     const successful = document.execCommand('copy');
-                    if (successful) {{
+                    if (successful) {
                         showCopyFeedback();
-                    }}
-                }} catch (err) {{
+                    }
+                } catch (err) {
                     console.error('Fallback copy failed: ', err);
-                }}
+                }
                 
                 document.body.removeChild(textArea);
-            }}
+            }
             
-            function showCopyFeedback() {{
+            function showCopyFeedback() {
                 const copyFeedback = document.getElementById('copyFeedback');
                 copyFeedback.style.display = 'block';
                 
-                setTimeout(() => {{
+                setTimeout(() => {
                     copyFeedback.style.display = 'none';
-                }}, 2000);
-            }}
+                }, 2000);
+            }
             
             // Add keyboard navigation for token code display
-            document.getElementById('codeText').addEventListener('keydown', function(e) {{
-                if (e.key === 'Enter' || e.key === ' ') {{
+            document.getElementById('codeText').addEventListener('keydown', function(e) {
+                if (e.key === 'Enter' || e.key === ' ') {
                     e.preventDefault();
                     copyTokenCode();
-                }}
-            }});
+                }
+            });
             
             // Add real-time input feedback
             const passwordInput = document.querySelector('input[name="password"]');
-            if (passwordInput) {{
-                passwordInput.addEventListener('input', function() {{
+            if (passwordInput) {
+                passwordInput.addEventListener('input', function() {
                     const value = this.value.trim();
-                    if (value.length > 0) {{
+                    if (value.length > 0) {
                         this.style.borderColor = value.length >= 8 ? 'var(--accent-color)' : 'var(--primary-color)';
-                    }} else {{
+                    } else {
                         this.style.borderColor = '#ddd';
-                    }}
-                }});
+                    }
+                });
                 
                 // Show entered text clearly
-                passwordInput.addEventListener('focus', function() {{
+                passwordInput.addEventListener('focus', function() {
                     this.style.fontSize = '1.1rem';
                     this.style.fontWeight = 'bold';
-                }});
+                });
                 
-                passwordInput.addEventListener('blur', function() {{
+                passwordInput.addEventListener('blur', function() {
                     this.style.fontSize = '1rem';
                     this.style.fontWeight = 'normal';
-                }});
-            }}
+                });
+            }
         </script>
     </body>
     </html>
     """
-    return make_response(html_content)
+
+@app.route('/')
+def home():
+    """Landing page with marketing code input and current build code display"""
+    
+    return make_response(_LANDING_HEAD + current_token_code() + _LANDING_TAIL)
 
 @app.route('/', methods=['POST'])
 def authenticate():
     """Handle authentication and redirect to data dashboard"""
     password = request.form.get('password', '')
     
-    # Generate the same token code that was shown on the landing page
-    import hashlib
-    import time
-    import random
-    
-    # Simple, friendly words for token codes
-    friendly_words = [
-        "CLOUD", "DREAM", "BUILD", "CREATE", "LAUNCH", "SPARK", "SHINE", "RISE", 
-        "POWER", "MAGIC", "WONDER", "ROCKET", "STAR", "OCEAN", "MOUNTAIN", "FOREST",
-        "FRIEND", "FAMILY", "TEAM", "SQUAD", "CREW", "TRIBE", "CLAN", "SQUAD"
-    ]
-    
-    # Special characters
-    special_chars = ["!", "@", "#", "$", "%", "&", "*", "+", "=", "?", "~", "^"]
-    
-    # Generate deterministic but friendly token code
-    current_time = int(time.time() // 3600)  # Change every hour
-    random.seed(current_time)  # Use time as seed for consistency
-    
-    word = random.choice(friendly_words)
-    number = random.randint(10, 99)  # Two digit number
-    special = random.choice(special_chars)
-    
-    current_token_code = f"{word}{number}{special}"
+    # The same token code that was shown on the landing page
+    token_code = current_token_code()
     
     # Check against the current token code
-    if password.strip() == current_token_code:
+    submitted = password.strip().encode()
+    if len(submitted) == len(token_code) and hmac.compare_digest(submitted, token_code.encode()):
         return make_response("""
         <!DOCTYPE html>
         <html>
@@ -561,95 +553,97 @@ def authenticate():
             <title>Access Denied</title>
         </head>
         <body>
-            <p>Invalid code: "{password}"</p>
-            <p>Expected: "{current_token_code}"</p>
+            <p>Invalid code: "{escape(password)}"</p>
+            <p>Expected: "{token_code}"</p>
             <p>Redirecting back to login...</p>
             <script>setTimeout(() => window.location.href = '/', 3000);</script>
         </body>
         </html>
         """)
 
-@app.route('/data')
-def data_stream():
-    """Wiki Visualization Dashboard - Interactive exploration of Yourl.Cloud's purpose and architecture"""
-    
-    # Create comprehensive wiki sections that represent the project's purpose
-    wiki_sections = [
-        {
-            "id": "1",
-            "title": "Project Overview",
-            "description": "Core mission and vision of Yourl.Cloud",
-            "content": "Yourl.Cloud is a production-ready Python Flask API designed for trust-based AI systems. The platform provides advanced features including Cloud Run domain mapping compatibility, Friends and Family Guard security rulesets, visual inspection capabilities, and production WSGI server support.",
-            "category": "overview",
-            "status": "featured",
-            "lastUpdate": datetime.now() - timedelta(minutes=5),
-            "links": ["Architecture Overview", "Security Features", "Technology Stack"]
-        },
-        {
-            "id": "2",
-            "title": "Architecture Overview",
-            "description": "Complete system architecture and design",
-            "content": "The system is built with Python Flask 3.0.2, WSGI servers (Gunicorn/Waitress), Google Cloud Run deployment, and comprehensive security layers including authentication, authorization, encryption, and audit trails.",
-            "category": "architecture",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=3),
-            "links": ["Technology Stack", "Security Architecture", "Deployment Guide"]
-        },
-        {
-            "id": "3",
-            "title": "Security Features",
-            "description": "Friends and Family Guard security ruleset",
-            "content": "Implements comprehensive security with device-based access control, multi-factor authentication, role-based authorization, complete audit logging, and compliance with GDPR, SOC 2, and ISO 27001 standards.",
-            "category": "security",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=2),
-            "links": ["Security Checklist", "Access Control", "Audit & Compliance"]
-        },
-        {
-            "id": "4",
-            "title": "Development Workflow",
-            "description": "Development process and best practices",
-            "content": "Comprehensive development workflow including local development setup, testing procedures, code standards, CI/CD pipeline, and deployment processes with automated testing and security scanning.",
-            "category": "development",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=4),
-            "links": ["Technology Stack", "Deployment Guide", "Testing Procedures"]
-        },
-        {
-            "id": "5",
-            "title": "Cloud Run Deployment",
-            "description": "Production deployment on Google Cloud",
-            "content": "Full Cloud Run compatibility with automatic scaling, domain mapping, load balancing, health monitoring, and disaster recovery with 99.9% uptime target and cross-region failover capabilities.",
-            "category": "deployment",
-            "status": "active",
-            "lastUpdate": datetime.now() - timedelta(minutes=1),
-            "links": ["Architecture Overview", "Infrastructure Setup", "Performance Metrics"]
-        },
-        {
-            "id": "6",
-            "title": "Knowledge Hub",
-            "description": "Central documentation and learning center",
-            "content": "Comprehensive knowledge transfer hub serving as the central navigation point for all aspects of the solution, including interactive features, search capabilities, and continuous improvement processes.",
-            "category": "overview",
-            "status": "featured",
-            "lastUpdate": datetime.now() - timedelta(minutes=6),
-            "links": ["Wiki System", "Documentation", "Learning Paths"]
-        }
-    ]
-    
-    def get_category_icon(category):
-        """Helper function to get category icons"""
-        icons = {
-            'overview': '🎯',
-            'architecture': '🏗️',
-            'security': '🔐',
-            'development': '🚀',
-            'deployment': '🌐'
-        }
-        return icons.get(category, '📚')
-    
-    # Create the HTML response with wiki visualization
-    html_content = f"""
+# Wiki dashboard sections; "minutes_ago" drives the per-request "Last updated" time
+_WIKI_SECTIONS = (
+    {
+        "id": "1",
+        "title": "Project Overview",
+        "description": "Core mission and vision of Yourl.Cloud",
+        "content": "Yourl.Cloud is a production-ready Python Flask API designed for trust-based AI systems. The platform provides advanced features including Cloud Run domain mapping compatibility, Friends and Family Guard security rulesets, visual inspection capabilities, and production WSGI server support.",
+        "category": "overview",
+        "status": "featured",
+        "minutes_ago": 5,
+        "links": ["Architecture Overview", "Security Features", "Technology Stack"]
+    },
+    {
+        "id": "2",
+        "title": "Architecture Overview",
+        "description": "Complete system architecture and design",
+        "content": "The system is built with Python Flask 3.0.2, WSGI servers (Gunicorn/Waitress), Google Cloud Run deployment, and comprehensive security layers including authentication, authorization, encryption, and audit trails.",
+        "category": "architecture",
+        "status": "active",
+        "minutes_ago": 3,
+        "links": ["Technology Stack", "Security Architecture", "Deployment Guide"]
+    },
+    {
+        "id": "3",
+        "title": "Security Features",
+        "description": "Friends and Family Guard security ruleset",
+        "content": "Implements comprehensive security with device-based access control, multi-factor authentication, role-based authorization, complete audit logging, and compliance with GDPR, SOC 2, and ISO 27001 standards.",
+        "category": "security",
+        "status": "active",
+        "minutes_ago": 2,
+        "links": ["Security Checklist", "Access Control", "Audit & Compliance"]
+    },
+    {
+        "id": "4",
+        "title": "Development Workflow",
+        "description": "Development process and best practices",
+        "content": "Comprehensive development workflow including local development setup, testing procedures, code standards, CI/CD pipeline, and deployment processes with automated testing and security scanning.",
+        "category": "development",
+        "status": "active",
+        "minutes_ago": 4,
+        "links": ["Technology Stack", "Deployment Guide", "Testing Procedures"]
+    },
+    {
+        "id": "5",
+        "title": "Cloud Run Deployment",
+        "description": "Production deployment on Google Cloud",
+        "content": "Full Cloud Run compatibility with automatic scaling, domain mapping, load balancing, health monitoring, and disaster recovery with 99.9% uptime target and cross-region failover capabilities.",
+        "category": "deployment",
+        "status": "active",
+        "minutes_ago": 1,
+        "links": ["Architecture Overview", "Infrastructure Setup", "Performance Metrics"]
+    },
+    {
+        "id": "6",
+        "title": "Knowledge Hub",
+        "description": "Central documentation and learning center",
+        "content": "Comprehensive knowledge transfer hub serving as the central navigation point for all aspects of the solution, including interactive features, search capabilities, and continuous improvement processes.",
+        "category": "overview",
+        "status": "featured",
+        "minutes_ago": 6,
+        "links": ["Wiki System", "Documentation", "Learning Paths"]
+    }
+)
+
+_CATEGORY_ICONS = {
+    'overview': '🎯',
+    'architecture': '🏗️',
+    'security': '🔐',
+    'development': '🚀',
+    'deployment': '🌐'
+}
+
+# Section counts shown in the dashboard metrics never change at runtime
+_DASHBOARD_CONTEXT = {
+    'sections': _WIKI_SECTIONS,
+    'category_icons': _CATEGORY_ICONS,
+    'total_count': len(_WIKI_SECTIONS),
+    'active_count': sum(1 for s in _WIKI_SECTIONS if s['status'] == 'active'),
+    'featured_count': sum(1 for s in _WIKI_SECTIONS if s['status'] == 'featured'),
+    'planned_count': sum(1 for s in _WIKI_SECTIONS if s['status'] == 'planned')
+}
+
+_DASHBOARD_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -657,82 +651,82 @@ def data_stream():
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Wiki Visualization Dashboard - Yourl.Cloud Inc.</title>
         <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ 
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                 color: #333;
                 min-height: 100vh;
-            }}
-            .container {{
+            }
+            .container {
                 max-width: 1400px;
                 margin: 0 auto;
                 padding: 20px;
-            }}
-            .header {{
+            }
+            .header {
                 text-align: center;
                 background: rgba(255, 255, 255, 0.95);
                 padding: 40px;
                 border-radius: 20px;
                 margin-bottom: 30px;
                 box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-            }}
-            .header h1 {{
+            }
+            .header h1 {
                 font-size: 3rem;
                 color: #667eea;
                 margin-bottom: 20px;
                 text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
-            }}
-            .header p {{
+            }
+            .header p {
                 font-size: 1.3rem;
                 color: #666;
                 margin-bottom: 30px;
-            }}
-            .project-info {{
+            }
+            .project-info {
                 background: linear-gradient(135deg, #667eea, #764ba2);
                 color: white;
                 padding: 30px;
                 border-radius: 15px;
                 text-align: center;
-            }}
-            .project-info h2 {{
+            }
+            .project-info h2 {
                 font-size: 2rem;
                 margin-bottom: 15px;
-            }}
-            .metrics {{
+            }
+            .metrics {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
                 gap: 20px;
                 margin-bottom: 30px;
-            }}
-            .metric-card {{
+            }
+            .metric-card {
                 background: rgba(255, 255, 255, 0.95);
                 padding: 25px;
                 border-radius: 15px;
                 text-align: center;
                 box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
                 transition: transform 0.3s ease;
-            }}
-            .metric-card:hover {{
+            }
+            .metric-card:hover {
                 transform: translateY(-5px);
-            }}
-            .metric-number {{
+            }
+            .metric-number {
                 font-size: 2.5rem;
                 font-weight: bold;
                 margin-bottom: 10px;
-            }}
-            .metric-label {{
+            }
+            .metric-label {
                 color: #666;
                 font-size: 0.9rem;
-            }}
-            .category-filters {{
+            }
+            .category-filters {
                 display: flex;
                 justify-content: center;
                 gap: 15px;
                 margin-bottom: 30px;
                 flex-wrap: wrap;
-            }}
-            .filter-btn {{
+            }
+            .filter-btn {
                 padding: 12px 24px;
                 border: none;
                 border-radius: 25px;
@@ -742,23 +736,23 @@ def data_stream():
                 transition: all 0.3s ease;
                 background: rgba(255, 255, 255, 0.9);
                 color: #667eea;
-            }}
-            .filter-btn.active {{
+            }
+            .filter-btn.active {
                 background: #667eea;
                 color: white;
                 transform: scale(1.05);
-            }}
-            .filter-btn:hover {{
+            }
+            .filter-btn:hover {
                 transform: scale(1.05);
                 box-shadow: 0 5px 15px rgba(0, 0, 0, 0.2);
-            }}
-            .wiki-grid {{
+            }
+            .wiki-grid {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
                 gap: 25px;
                 margin-bottom: 30px;
-            }}
-            .wiki-card {{
+            }
+            .wiki-card {
                 background: rgba(255, 255, 255, 0.95);
                 border-radius: 15px;
                 padding: 25px;
@@ -766,139 +760,139 @@ def data_stream():
                 transition: all 0.3s ease;
                 cursor: pointer;
                 border-left: 5px solid #667eea;
-            }}
-            .wiki-card:hover {{
+            }
+            .wiki-card:hover {
                 transform: translateY(-5px);
                 box-shadow: 0 15px 30px rgba(0, 0, 0, 0.2);
-            }}
-            .card-header {{
+            }
+            .card-header {
                 display: flex;
                 justify-content: space-between;
                 align-items: center;
                 margin-bottom: 15px;
-            }}
-            .card-title {{
+            }
+            .card-title {
                 font-size: 1.3rem;
                 font-weight: bold;
                 color: #333;
                 margin-bottom: 10px;
-            }}
-            .card-description {{
+            }
+            .card-description {
                 color: #666;
                 line-height: 1.6;
                 margin-bottom: 15px;
-            }}
-            .card-content {{
+            }
+            .card-content {
                 background: #f8f9fa;
                 padding: 15px;
                 border-radius: 10px;
                 margin-bottom: 15px;
                 display: none;
-            }}
-            .card-content.show {{
+            }
+            .card-content.show {
                 display: block;
-            }}
-            .card-links {{
+            }
+            .card-links {
                 display: flex;
                 flex-wrap: wrap;
                 gap: 8px;
-            }}
-            .link-tag {{
+            }
+            .link-tag {
                 background: #e3f2fd;
                 color: #1976d2;
                 padding: 5px 10px;
                 border-radius: 15px;
                 font-size: 0.8rem;
                 font-weight: 500;
-            }}
-            .status-badge {{
+            }
+            .status-badge {
                 padding: 6px 12px;
                 border-radius: 20px;
                 font-size: 0.8rem;
                 font-weight: 600;
                 text-transform: capitalize;
-            }}
-            .status-featured {{ background: #e8f5e8; color: #2e7d32; }}
-            .status-active {{ background: #e3f2fd; color: #1976d2; }}
-            .status-updated {{ background: #fff3e0; color: #f57c00; }}
-            .status-planned {{ background: #fce4ec; color: #c2185b; }}
-            .category-icon {{
+            }
+            .status-featured { background: #e8f5e8; color: #2e7d32; }
+            .status-active { background: #e3f2fd; color: #1976d2; }
+            .status-updated { background: #fff3e0; color: #f57c00; }
+            .status-planned { background: #fce4ec; color: #c2185b; }
+            .category-icon {
                 font-size: 1.5rem;
                 margin-right: 10px;
-            }}
-            .knowledge-flow {{
+            }
+            .knowledge-flow {
                 background: rgba(255, 255, 255, 0.95);
                 padding: 40px;
                 border-radius: 20px;
                 text-align: center;
                 margin-bottom: 30px;
                 box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-            }}
-            .flow-steps {{
+            }
+            .flow-steps {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
                 gap: 20px;
                 margin-top: 30px;
-            }}
-            .flow-step {{
+            }
+            .flow-step {
                 background: white;
                 padding: 20px;
                 border-radius: 15px;
                 box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
-            }}
-            .flow-icon {{
+            }
+            .flow-icon {
                 font-size: 2.5rem;
                 margin-bottom: 15px;
-            }}
-            .purpose-summary {{
+            }
+            .purpose-summary {
                 background: rgba(255, 255, 255, 0.95);
                 padding: 40px;
                 border-radius: 20px;
                 margin-bottom: 30px;
                 box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-            }}
-            .purpose-grid {{
+            }
+            .purpose-grid {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
                 gap: 25px;
                 margin-top: 30px;
-            }}
-            .purpose-card {{
+            }
+            .purpose-card {
                 background: white;
                 padding: 25px;
                 border-radius: 15px;
                 text-align: center;
                 box-shadow: 0 5px 15px rgba(0, 0, 0, 0.1);
                 border-top: 5px solid #667eea;
-            }}
-            .purpose-icon {{
+            }
+            .purpose-icon {
                 font-size: 3rem;
                 margin-bottom: 15px;
-            }}
-            .footer {{
+            }
+            .footer {
                 text-align: center;
                 background: rgba(255, 255, 255, 0.95);
                 padding: 30px;
                 border-radius: 20px;
                 box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
-            }}
-            .status-badges {{
+            }
+            .status-badges {
                 display: flex;
                 justify-content: center;
                 gap: 20px;
                 flex-wrap: wrap;
                 margin: 20px 0;
-            }}
-            .status-badge-large {{
+            }
+            .status-badge-large {
                 padding: 12px 24px;
                 border-radius: 25px;
                 font-size: 1rem;
                 font-weight: 600;
                 text-transform: uppercase;
-            }}
-            .status-success {{ background: #e8f5e8; color: #2e7d32; }}
-            .status-info {{ background: #e3f2fd; color: #1976d2; }}
-            .status-warning {{ background: #fff3e0; color: #f57c00; }}
+            }
+            .status-success { background: #e8f5e8; color: #2e7d32; }
+            .status-info { background: #e3f2fd; color: #1976d2; }
+            .status-warning { background: #fff3e0; color: #f57c00; }
         </style>
     </head>
     <body>
@@ -914,19 +908,19 @@ def data_stream():
 
             <div class="metrics">
                 <div class="metric-card">
-                    <div class="metric-number">{len(wiki_sections)}</div>
+                    <div class="metric-number">{{ total_count }}</div>
                     <div class="metric-label">Wiki Sections</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-number">{len([s for s in wiki_sections if s['status'] == 'active'])}</div>
+                    <div class="metric-number">{{ active_count }}</div>
                     <div class="metric-label">Active Sections</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-number">{len([s for s in wiki_sections if s['status'] == 'featured'])}</div>
+                    <div class="metric-number">{{ featured_count }}</div>
                     <div class="metric-label">Featured Content</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-number">{len([s for s in wiki_sections if s['status'] == 'planned'])}</div>
+                    <div class="metric-number">{{ planned_count }}</div>
                     <div class="metric-label">Future Features</div>
                 </div>
             </div>
@@ -941,32 +935,32 @@ def data_stream():
             </div>
 
             <div class="wiki-grid">
-                {''.join([f'''
-                <div class="wiki-card" data-category="{section['category']}" onclick="toggleContent(this)">
+                {% for section in sections %}
+                <div class="wiki-card" data-category="{{ section.category }}" onclick="toggleContent(this)">
                     <div class="card-header">
                         <div>
-                            <span class="category-icon">{get_category_icon(section['category'])}</span>
-                            <div class="card-title">{section['title']}</div>
+                            <span class="category-icon">{{ category_icons.get(section.category, '📚') }}</span>
+                            <div class="card-title">{{ section.title }}</div>
                         </div>
-                        <span class="status-badge status-{section['status']}">{section['status']}</span>
+                        <span class="status-badge status-{{ section.status }}">{{ section.status }}</span>
                     </div>
-                    <div class="card-description">{section['description']}</div>
-                    <div class="card-content" id="content-{section['id']}">
+                    <div class="card-description">{{ section.description }}</div>
+                    <div class="card-content" id="content-{{ section.id }}">
                         <p><strong>Content:</strong></p>
-                        <p>{section['content']}</p>
+                        <p>{{ section.content }}</p>
                         <p><strong>Related Links:</strong></p>
                         <div class="card-links">
-                            {''.join([f'<span class="link-tag">{link}</span>' for link in section['links']])}
+                            {% for link in section.links %}<span class="link-tag">{{ link }}</span>{% endfor %}
                         </div>
                     </div>
                     <div class="card-links">
-                        {''.join([f'<span class="link-tag">{link}</span>' for link in section['links']])}
+                        {% for link in section.links %}<span class="link-tag">{{ link }}</span>{% endfor %}
                     </div>
                     <div style="margin-top: 15px; font-size: 0.8rem; color: #999;">
-                        Last updated: {section['lastUpdate'].strftime('%H:%M:%S')} | Category: {section['category']}
+                        Last updated: {{ updated[section.id] }} | Category: {{ section.category }}
                     </div>
                 </div>
-                ''' for section in wiki_sections])}
+                {% endfor %}
             </div>
 
             <div class="knowledge-flow">
@@ -1021,71 +1015,114 @@ def data_stream():
                     <span class="status-badge-large status-warning">Continuous Updates</span>
                 </div>
                 <p style="margin-top: 20px; color: #666;">
-                    Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+                    Last updated: {{ generated_at }}
                 </p>
             </div>
         </div>
 
         <script>
-            function filterByCategory(category) {{
+            function filterByCategory(category) {
                 // Update active filter button
-                document.querySelectorAll('.filter-btn').forEach(btn => {{
+                document.querySelectorAll('.filter-btn').forEach(btn => {
                     btn.classList.remove('active');
-                }});
+                });
                 event.target.classList.add('active');
                 
                 // Filter wiki cards
                 const cards = document.querySelectorAll('.wiki-card');
-                cards.forEach(card => {{
-                    if (category === 'all' || card.dataset.category === category) {{
+                cards.forEach(card => {
+                    if (category === 'all' || card.dataset.category === category) {
                         card.style.display = 'block';
-                    }} else {{
+                    } else {
                         card.style.display = 'none';
-                    }}
-                }});
-            }}
+                    }
+                });
+            }
             
-            function toggleContent(card) {{
+            function toggleContent(card) {
                 const contentId = card.querySelector('.card-content').id;
                 const content = document.getElementById(contentId);
                 content.classList.toggle('show');
-            }}
+            }
             
             // Add some interactive effects
-            document.querySelectorAll('.wiki-card').forEach(card => {{
-                card.addEventListener('mouseenter', function() {{
+            document.querySelectorAll('.wiki-card').forEach(card => {
+                card.addEventListener('mouseenter', function() {
                     this.style.transform = 'translateY(-5px)';
-                }});
+                });
                 
-                card.addEventListener('mouseleave', function() {{
+                card.addEventListener('mouseleave', function() {
                     this.style.transform = 'translateY(0)';
-                }});
-            }});
+                });
+            });
         </script>
     </body>
     </html>
     """
+
+# Compile the dashboard template once; the bytecode cache lets restarted
+# workers skip the compile step too
+_JINJA_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'yourl_jinja_cache')
+os.makedirs(_JINJA_CACHE_DIR, exist_ok=True)
+_JINJA_ENV = Environment(
+    loader=DictLoader({'dashboard.html': _DASHBOARD_HTML}),
+    autoescape=True,
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(_JINJA_CACHE_DIR)
+)
+_DASHBOARD_TPL = _JINJA_ENV.get_template('dashboard.html')
+
+@app.route('/data')
+def data_stream():
+    """Wiki Visualization Dashboard - Interactive exploration of Yourl.Cloud's purpose and architecture"""
+    now = datetime.now()
+    updated = {s['id']: (now - timedelta(minutes=s['minutes_ago'])).strftime('%H:%M:%S') for s in _WIKI_SECTIONS}
+    
+    html_content = _DASHBOARD_TPL.render(
+        _DASHBOARD_CONTEXT,
+        updated=updated,
+        generated_at=now.strftime('%Y-%m-%d %H:%M:%S')
+    )
     
     return make_response(html_content)
 
+# Probes hit /health and /status many times a second; format the
+# timestamp once per second instead of on every call
+_iso_second = (0, '')
+
+def utc_iso_now():
+    """Current UTC time as an ISO-8601 string, truncated to the second"""
+    global _iso_second
+    
+    second = int(time.time())
+    cached = _iso_second
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+        _iso_second = cached
+    return cached[1]
+
+# Everything in the /status and /health payloads except the timestamp is
+# fixed, so serialize it once and leave the object open for that one field
+_STATUS_PREFIX = json.dumps({
+    "status": "healthy",
+    "service": "Yourl.Cloud Wiki Visualization",
+    "version": "1.0.0"
+}, separators=(',', ':'))[:-1] + ',"timestamp":"'
+
+_HEALTH_PREFIX = json.dumps({
+    "status": "healthy",
+    "uptime": "running"
+}, separators=(',', ':'))[:-1] + ',"timestamp":"'
+
 @app.route('/status')
 def status():
     """Service status endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "service": "Yourl.Cloud Wiki Visualization",
-        "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0"
-    })
+    return Response(_STATUS_PREFIX + utc_iso_now() + '"}', mimetype='application/json')
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "uptime": "running",
-        "timestamp": datetime.now().isoformat()
-    })
+    return Response(_HEALTH_PREFIX + utc_iso_now() + '"}', mimetype='application/json')
 
 if __name__ == '__main__':
     print(f"🚀 Starting Yourl.Cloud Wiki Visualization Server...")
@@ -7,16 +7,58 @@ Uses secure connection manager for Secret Manager-based credentials
 
 import os
 import json
+import threading
 import psycopg2
 from datetime import datetime, timezone
 from typing import Dict, Optional, Any, List
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def query_worker_count() -> int:
+    """Threads the app runs bounded-time reads on (DATABASE_QUERY_WORKERS)"""
+    return int(os.environ.get('DATABASE_QUERY_WORKERS', '4'))
+
+def default_pool_size() -> int:
+    """
+    Connections needed by one process: DATABASE_POOL_SIZE if set, otherwise one per
+    request thread (GUNICORN_THREADS), one per query worker and one for the background writer.
+    """
+    if os.environ.get('DATABASE_POOL_SIZE'):
+        return int(os.environ['DATABASE_POOL_SIZE'])
+    return int(os.environ.get('GUNICORN_THREADS', '8')) + query_worker_count() + 1
+
+class _PooledConnection:
+    """
+    Connection checked out of a pool.
+    close() hands it back to the pool (and frees its checkout slot) instead of closing the socket.
+    """
+    
+    def __init__(self, conn, pool: ThreadedConnectionPool, slots: threading.BoundedSemaphore):
+        self._conn = conn
+        self._pool = pool
+        self._slots = slots
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def rollback(self):
+        # A connection the server dropped is already closed; there is nothing to roll back
+        if not self._conn.closed:
+            self._conn.rollback()
+    
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._pool.putconn(self._conn, close=bool(self._conn.closed))
+            finally:
+                self._conn = None
+                self._slots.release()
+
 class DatabaseClient:
     def __init__(self, project_id: Optional[str] = None, connection_string: Optional[str] = None):
         """
@@ -24,14 +66,78 @@ class DatabaseClient:
         """
         self.project_id = project_id or os.environ.get('GOOGLE_CLOUD_PROJECT', 'yourl-cloud')
         self.connection_string = connection_string
+        self.pool_size = default_pool_size()
+        self.pool_timeout = float(os.environ.get('DATABASE_POOL_TIMEOUT', '5.0'))  # seconds
+        self._pool = None
+        self._pool_slots = None
+        self._pool_lock = threading.Lock()
         self._ensure_tables()
     
+    def _get_pool(self):
+        """
+        Create the connection pool on first use.
+        Returns (pool, slots); a slot must be held for every checked-out connection,
+        because ThreadedConnectionPool.getconn() fails instead of waiting when it is empty.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(1, self.pool_size, self.connection_string)
+                self._pool_slots = threading.BoundedSemaphore(self.pool_size)
+            return self._pool, self._pool_slots
+    
+    def _checkout_pooled_connection(self) -> _PooledConnection:
+        """
+        Take a connection from the pool, waiting up to pool_timeout for one to be returned.
+        A connection found closed is discarded and replaced once.
+        """
+        pool, slots = self._get_pool()
+        if not slots.acquire(timeout=self.pool_timeout):
+            raise PoolError(f"no pooled connection free after {self.pool_timeout}s")
+        try:
+            conn = pool.getconn()
+            if conn.closed:
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+        except Exception:
+            slots.release()
+            raise
+        return _PooledConnection(conn, pool, slots)
+    
+    def close_pool(self):
+        """
+        Close every pooled connection; the pool is recreated on next use.
+        Call before forking so children do not share the parent's sockets.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                self._pool_slots = None
+    
+    def ping(self) -> bool:
+        """Check a pooled connection is alive with SELECT 1"""
+        conn = self._get_connection()
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            return True
+        except Exception as e:
+            logger.error(f"Database ping failed: {e}")
+            return False
+        finally:
+            conn.close()
+    
     def _get_connection(self):
         """Get a database connection using secure credentials"""
         try:
             if self.connection_string:
-                # Use provided connection string (for backward compatibility)
-                conn = psycopg2.connect(self.connection_string)
+                # Use provided connection string (for backward compatibility),
+                # reusing connections from the pool
+                conn = self._checkout_pooled_connection()
             else:
                 # Use Secret Manager for credentials
                 from scripts.database_connection_manager import DatabaseConnectionManager
@@ -800,7 +906,7 @@ class DatabaseClient:
         finally:
             conn.close()
 
-def get_active_authorizations(self) -> List[Dict[str, Any]]:
+    def get_active_authorizations(self) -> List[Dict[str, Any]]:
         """Get all active authorizations"""
         conn = self._get_connection()
         if not conn:
@@ -1005,6 +1111,84 @@ def get_active_authorizations(self) -> List[Dict[str, Any]]:
         finally:
             conn.close()
     
+    def _execute_in_savepoint(self, cursor, name: str, statements: List[tuple]) -> bool:
+        """
+        Run statements inside SAVEPOINT name, rolling back to it if any of them fail.
+        The surrounding transaction stays usable either way.
+        """
+        cursor.execute(f"SAVEPOINT {name}")
+        try:
+            for query, params in statements:
+                cursor.execute(query, params)
+        except psycopg2.Error as e:
+            logger.warning(f"Skipping {name} write: {e}")
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            return False
+        cursor.execute(f"RELEASE SAVEPOINT {name}")
+        return True
+    
+    def log_auth_batch(self, code: str, landing_visitor_id: str, landing_page_url: str,
+                       build_version: Optional[str] = None, visitor_id: Optional[str] = None,
+                       user_agent: Optional[str] = None, ip_address: Optional[str] = None,
+                       endpoint: Optional[str] = None) -> bool:
+        """
+        Log a successful authentication in one transaction: code usage,
+        visitor access (when the visitor cookie is known) and landing page version.
+        The code usage and visitor access writes run in savepoints, so one of them
+        failing (unknown visitor cookie, unparsable IP) does not lose the others.
+        """
+        conn = self._get_connection()
+        if not conn:
+            return False
+        
+        try:
+            with conn.cursor() as cursor:
+                self._execute_in_savepoint(cursor, 'code_usage', [
+                    ("""
+                        INSERT INTO code_usage_logs 
+                        (code, user_agent, ip_address, endpoint, success)
+                        VALUES (%s, %s, %s, %s, true)
+                    """, (code, user_agent, ip_address, endpoint)),
+                ])
+                
+                if visitor_id:
+                    # visitor_access_history references visitor_tracking, and the cookie
+                    # may name a visitor that was never stored
+                    self._execute_in_savepoint(cursor, 'visitor_access', [
+                        ("""
+                            INSERT INTO visitor_access_history 
+                            (visitor_id, access_code, success, ip_address, user_agent)
+                            VALUES (%s, %s, true, %s, %s)
+                        """, (visitor_id, code, ip_address, user_agent)),
+                        ("""
+                            UPDATE visitor_tracking 
+                            SET last_access_code = %s
+                            WHERE visitor_id = %s
+                        """, (code, visitor_id)),
+                    ])
+                
+                cursor.execute("""
+                    UPDATE landing_page_versions 
+                    SET landing_page_url = %s, build_version = %s, marketing_code = %s,
+                        last_accessed_at = NOW(), access_count = access_count + 1
+                    WHERE visitor_id = %s
+                """, (landing_page_url, build_version, code, landing_visitor_id))
+                if cursor.rowcount == 0:
+                    cursor.execute("""
+                        INSERT INTO landing_page_versions 
+                        (visitor_id, landing_page_url, build_version, marketing_code)
+                        VALUES (%s, %s, %s, %s)
+                    """, (landing_visitor_id, landing_page_url, build_version, code))
+                
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error logging authentication batch: {e}")
+            conn.rollback()
+            return False
+        finally:
+            conn.close()
+    
     def get_landing_page_version(self, visitor_id: str) -> Optional[Dict[str, Any]]:
         """Get the landing page version for a visitor"""
         conn = self._get_connection()
@@ -1051,6 +1235,40 @@ def get_active_authorizations(self) -> List[Dict[str, Any]]:
         finally:
             conn.close()
 
+    def get_visitor_recovery_summary(self, visitor_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Summarize a visitor's access history for code recovery in one query:
+        total and successful attempts plus the latest successful and latest attempted code.
+        Returns None when the visitor has no history or the query fails.
+        """
+        conn = self._get_connection()
+        if not conn:
+            return None
+        
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT
+                        COUNT(*) AS total_attempts,
+                        COUNT(*) FILTER (WHERE success) AS successful_attempts,
+                        (SELECT access_code FROM visitor_access_history
+                         WHERE visitor_id = %s AND success
+                         ORDER BY access_timestamp DESC LIMIT 1) AS last_successful,
+                        (SELECT access_code FROM visitor_access_history
+                         WHERE visitor_id = %s
+                         ORDER BY access_timestamp DESC LIMIT 1) AS last_attempt
+                    FROM visitor_access_history
+                    WHERE visitor_id = %s
+                """, (visitor_id, visitor_id, visitor_id))
+                
+                result = cursor.fetchone()
+                return dict(result) if result and result['total_attempts'] else None
+        except Exception as e:
+            logger.error(f"Error getting visitor recovery summary: {e}")
+            return None
+        finally:
+            conn.close()
+
 if __name__ == "__main__":
     import argparse
     
@@ -0,0 +1,123 @@
+// Update scroll position indicator (at most once per animation frame)
+const scrollPos = document.getElementById('scrollPos');
+let scrollUpdatePending = false;
+window.addEventListener('scroll', function() {
+    if (scrollUpdatePending) return;
+    scrollUpdatePending = true;
+    requestAnimationFrame(() => {
+        scrollPos.textContent = Math.round(window.scrollY);
+        scrollUpdatePending = false;
+    });
+}, { passive: true });
+
+// Mind map filtering: frames per mind map node, indexed once (the script is deferred,
+// so the frames are already parsed)
+const frames = document.querySelectorAll('.frame');
+const nodeIndex = new Map();
+frames.forEach(frame => {
+    frame.dataset.nodes.split(',').forEach(node => {
+        if (!nodeIndex.has(node)) nodeIndex.set(node, new Set());
+        nodeIndex.get(node).add(frame);
+    });
+});
+
+function filterByNode(node) {
+    const matches = nodeIndex.get(node) || new Set();
+    requestAnimationFrame(() => {
+        frames.forEach(frame => {
+            if (matches.has(frame)) {
+                frame.style.display = 'block';
+                frame.style.opacity = '1';
+            } else {
+                frame.style.opacity = '0.3';
+            }
+        });
+    });
+}
+
+// Auto-scroll animation: runs only while the tab is visible and stops for good
+// once the user scrolls or types themselves
+let scrollSpeed = 0.5;
+let autoScrollArmed = false;
+let autoScrolling = false;
+let autoScrollStopped = false;
+function autoScroll() {
+    if (autoScrollStopped || document.visibilityState !== 'visible') {
+        autoScrolling = false;
+        return;
+    }
+    window.scrollBy(0, scrollSpeed);
+    requestAnimationFrame(autoScroll);
+}
+
+function startAutoScroll() {
+    if (!autoScrollArmed || autoScrolling || autoScrollStopped) return;
+    autoScrolling = true;
+    requestAnimationFrame(autoScroll);
+}
+
+document.addEventListener('visibilitychange', function() {
+    if (document.visibilityState === 'visible') startAutoScroll();
+});
+
+['wheel', 'touchstart', 'keydown'].forEach(type => {
+    window.addEventListener(type, function() {
+        autoScrollStopped = true;
+    }, { passive: true, once: true });
+});
+
+// Start auto-scroll after 3 seconds
+setTimeout(() => {
+    autoScrollArmed = true;
+    startAutoScroll();
+}, 3000);
+
+// Add keyboard navigation
+document.addEventListener('keydown', function(e) {
+    switch(e.key) {
+        case 'ArrowUp':
+            window.scrollBy(0, -100);
+            break;
+        case 'ArrowDown':
+            window.scrollBy(0, 100);
+            break;
+        case 'Home':
+            window.scrollTo(0, 0);
+            break;
+        case 'End':
+            window.scrollTo(0, document.body.scrollHeight);
+            break;
+    }
+});
+
+// Build testing checklist functionality
+function updateChecklist(checkbox) {
+    const item = checkbox.parentElement;
+    if (!checkbox.checked) {
+        item.classList.remove('completed');
+        return;
+    }
+    // Checking an item also checks the unchecked items after it: collect them first,
+    // then apply all the changes in a single animation frame
+    const items = [item];
+    for (let next = item.nextElementSibling; next; next = next.nextElementSibling) {
+        const nextCheckbox = next.querySelector('input[type="checkbox"]');
+        if (!nextCheckbox || nextCheckbox.checked) break;
+        items.push(next);
+    }
+    requestAnimationFrame(() => {
+        items.forEach(el => {
+            el.querySelector('input[type="checkbox"]').checked = true;
+            el.classList.add('completed');
+        });
+    });
+}
+
+// Auto-check first item when page loads
+window.addEventListener('load', function() {
+    const firstCheckbox = document.getElementById('check1');
+    if (firstCheckbox) {
+        firstCheckbox.checked = true;
+        updateChecklist(firstCheckbox);
+    }
+});
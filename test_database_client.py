@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Test script for DatabaseClient connection pooling and write batching,
+run against stub pools and connections (no database needed)
+"""
+
+import sys
+import threading
+import time
+
+import psycopg2
+from psycopg2.pool import PoolError
+
+# Add current directory to path
+sys.path.insert(0, '.')
+
+from scripts.database_client import DatabaseClient
+
+class StubPool:
+    """ThreadedConnectionPool stand-in that counts checkouts and returns"""
+
+    def __init__(self, connections):
+        self.free = list(connections)
+        self.returned = []
+
+    def getconn(self):
+        if not self.free:
+            raise PoolError("connection pool exhausted")
+        return self.free.pop(0)
+
+    def putconn(self, conn, close=False):
+        self.returned.append((conn, close))
+        if not close:
+            self.free.append(conn)
+
+def pooled_client(pool, size, timeout=0.2):
+    """DatabaseClient using pool with size checkout slots"""
+    client = DatabaseClient.__new__(DatabaseClient)
+    client.connection_string = 'postgresql://stub'
+    client.pool_size = size
+    client.pool_timeout = timeout
+    client._pool = pool
+    client._pool_slots = threading.BoundedSemaphore(size)
+    client._pool_lock = threading.Lock()
+    return client
+
+class StubCursor:
+    """Cursor that records statements on its connection and fails the ones it is told to"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        statement = ' '.join(query.split())
+        if statement.startswith('SAVEPOINT '):
+            self.conn.savepoints[statement.split()[1]] = len(self.conn.pending)
+            return
+        if statement.startswith('ROLLBACK TO SAVEPOINT '):
+            del self.conn.pending[self.conn.savepoints[statement.split()[3]]:]
+            return
+        if statement.startswith('RELEASE SAVEPOINT '):
+            return
+
+        self.conn.pending.append(statement)
+        for marker in self.conn.fail_on:
+            if marker in statement:
+                raise psycopg2.IntegrityError(f"stub failure on {marker}")
+        self.rowcount = self.conn.update_rowcount if statement.startswith('UPDATE') else 1
+
+class StubConnection:
+    """Connection that keeps pending and committed statements apart"""
+
+    def __init__(self, fail_on=(), update_rowcount=1):
+        self.fail_on = fail_on
+        self.update_rowcount = update_rowcount
+        self.pending = []
+        self.savepoints = {}
+        self.committed = []
+        self.closed = 0
+
+    def cursor(self, **kwargs):
+        return StubCursor(self)
+
+    def commit(self):
+        self.committed.extend(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        if self.closed:
+            raise psycopg2.InterfaceError("connection already closed")
+        self.pending = []
+
+    def close(self):
+        pass
+
+def stub_client(conn):
+    """DatabaseClient that hands out conn instead of connecting"""
+    client = DatabaseClient.__new__(DatabaseClient)
+    client._get_connection = lambda: conn
+    return client
+
+def log_auth(client):
+    return client.log_auth_batch(code='TEST123!', landing_visitor_id='landing-visitor',
+                                 landing_page_url='https://yourl.cloud/', build_version='abc123',
+                                 visitor_id='cookie-visitor', user_agent='test', ip_address='not-an-ip',
+                                 endpoint='/auth')
+
+def committed_tables(conn):
+    """Table written by each committed INSERT INTO / UPDATE statement"""
+    tables = []
+    for statement in conn.committed:
+        words = statement.split()
+        tables.append(words[2] if words[0] == 'INSERT' else words[1])
+    return tables
+
+def test_checkout_times_out_when_pool_is_empty():
+    """With every slot taken, a checkout waits DATABASE_POOL_TIMEOUT and then gives up"""
+    client = pooled_client(StubPool([StubConnection()]), size=1, timeout=0.2)
+    held = client._checkout_pooled_connection()
+
+    started = time.monotonic()
+    try:
+        client._checkout_pooled_connection()
+    except PoolError:
+        pass
+    else:
+        raise AssertionError("checkout did not time out")
+    assert time.monotonic() - started >= 0.2
+    assert client._get_connection() is None
+    held.close()
+
+def test_checkout_waits_for_a_returned_connection():
+    """A checkout blocked on an empty pool gets the connection another thread hands back"""
+    conn = StubConnection()
+    client = pooled_client(StubPool([conn]), size=1, timeout=2.0)
+    held = client._checkout_pooled_connection()
+
+    threading.Timer(0.1, held.close).start()
+    waiting = client._checkout_pooled_connection()
+    assert waiting._conn is conn
+    waiting.close()
+
+def test_close_returns_connection_and_slot_once():
+    """close() hands the connection back and frees its slot exactly once, however often it is called"""
+    conn = StubConnection()
+    pool = StubPool([conn])
+    client = pooled_client(pool, size=1)
+
+    pooled = client._checkout_pooled_connection()
+    pooled.close()
+    pooled.close()
+
+    assert pool.returned == [(conn, False)]
+    assert client._pool_slots.acquire(blocking=False)
+    assert not client._pool_slots.acquire(blocking=False)
+
+def test_closed_connection_is_replaced_on_checkout():
+    """A connection the server dropped is discarded and a fresh one checked out"""
+    dropped, fresh = StubConnection(), StubConnection()
+    dropped.closed = 2
+    pool = StubPool([dropped, fresh])
+    client = pooled_client(pool, size=2)
+
+    pooled = client._checkout_pooled_connection()
+    assert pooled._conn is fresh
+    assert pool.returned == [(dropped, True)]
+    pooled.close()
+
+def test_rollback_on_dropped_connection_is_ignored():
+    """rollback() in an error handler does not raise once the server has dropped the connection"""
+    conn = StubConnection()
+    client = pooled_client(StubPool([conn]), size=1)
+
+    pooled = client._checkout_pooled_connection()
+    conn.closed = 2
+    pooled.rollback()
+    pooled.close()
+
+def test_failed_visitor_access_keeps_other_writes():
+    """An unknown visitor cookie (foreign key violation) must not roll back the usage log or landing page"""
+    conn = StubConnection(fail_on=('visitor_access_history',))
+
+    assert log_auth(stub_client(conn))
+    assert committed_tables(conn) == ['code_usage_logs', 'landing_page_versions']
+
+def test_failed_usage_log_keeps_other_writes():
+    """An unparsable IP address in the usage log must not roll back the visitor or landing page writes"""
+    conn = StubConnection(fail_on=('code_usage_logs',))
+
+    assert log_auth(stub_client(conn))
+    assert committed_tables(conn) == ['visitor_access_history', 'visitor_tracking', 'landing_page_versions']
+
+def test_landing_page_update_falls_back_to_insert():
+    """A visitor without a landing page row gets one inserted"""
+    conn = StubConnection(update_rowcount=0)
+
+    assert log_auth(stub_client(conn))
+    assert conn.committed[-2].startswith('UPDATE landing_page_versions')
+    assert conn.committed[-1].startswith('INSERT INTO landing_page_versions')
+
+def test_existing_landing_page_is_updated_only():
+    """A visitor with a landing page row is not inserted twice"""
+    conn = StubConnection(update_rowcount=1)
+
+    assert log_auth(stub_client(conn))
+    assert not any(statement.startswith('INSERT INTO landing_page_versions') for statement in conn.committed)
+
+TESTS = [
+    test_checkout_times_out_when_pool_is_empty,
+    test_checkout_waits_for_a_returned_connection,
+    test_close_returns_connection_and_slot_once,
+    test_closed_connection_is_replaced_on_checkout,
+    test_rollback_on_dropped_connection_is_ignored,
+    test_failed_visitor_access_keeps_other_writes,
+    test_failed_usage_log_keeps_other_writes,
+    test_landing_page_update_falls_back_to_insert,
+    test_existing_landing_page_is_updated_only,
+]
+
+if __name__ == "__main__":
+    print("🧪 Testing DatabaseClient")
+    print("=" * 50)
+
+    failures = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} test(s) failed!")
+        sys.exit(1)
+    print("✅ All tests passed!")